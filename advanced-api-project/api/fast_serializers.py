@@ -0,0 +1,91 @@
+"""
+Read-only serializers over ``QuerySet.values()`` rows.
+
+A ``ValuesSerializer`` mirrors an existing ``serializer_class``: the fields
+of that serializer are compiled once into (name, column, converter) entries,
+rows are fetched with ``.values()`` instead of model instances, and each row
+becomes the same dict the original serializer would produce, so rendered
+responses are byte-identical. Converters are the plain type constructors the
+DRF fields use (``int``, ``str``) or the field's own ``to_representation``.
+
+Fields that are not a single column (nested serializers, method fields) are
+filled by a ``get_<name>_map(pks)`` method on the subclass, returning the
+value for each primary key; missing keys render as an empty list.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+
+
+def compile_field(field):
+    """
+    Return the converter for a column value, or None when it is used as is.
+    """
+    if isinstance(field, serializers.ReadOnlyField):
+        return None
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        # .values() yields the foreign key itself.
+        return None
+    if type(field) is serializers.IntegerField:
+        return int
+    if type(field) is serializers.CharField:
+        return str
+    return field.to_representation
+
+
+class ValuesSerializer:
+    """
+    Serialize querysets through ``.values()`` with ``serializer_class``'s output.
+    """
+    serializer_class = None
+    
+    def __init__(self, context=None):
+        serializer = self.serializer_class(context=context or {})
+        model = serializer.Meta.model
+        self.pk_name = model._meta.pk.attname
+        self.columns = [self.pk_name]
+        self.fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            nested = getattr(self, f'get_{name}_map', None)
+            if nested is not None:
+                self.fields.append((name, None, nested))
+                continue
+            if field.source == '*' or isinstance(field, serializers.BaseSerializer):
+                raise ImproperlyConfigured(
+                    f'{type(self).__name__} needs a get_{name}_map() method for the {name!r} field.'
+                )
+            column = '__'.join(field.source_attrs)
+            if column == model._meta.pk.name:
+                column = self.pk_name
+            if column not in self.columns:
+                self.columns.append(column)
+            self.fields.append((name, column, compile_field(field)))
+    
+    def values(self, queryset, extra=()):
+        """
+        ``queryset.values()`` with every column the output needs, plus ``extra``
+        (for example the pagination keys).
+        """
+        columns = list(self.columns)
+        columns.extend(column for column in extra if column not in columns)
+        return queryset.values(*columns)
+    
+    def serialize_rows(self, rows):
+        rows = list(rows)
+        pks = [row[self.pk_name] for row in rows]
+        maps = {name: nested(pks) for name, column, nested in self.fields if column is None}
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in self.fields:
+                if column is None:
+                    item[name] = maps[name].get(row[self.pk_name], [])
+                    continue
+                value = row[column]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+    
+    def serialize(self, queryset):
+        return self.serialize_rows(self.values(queryset))
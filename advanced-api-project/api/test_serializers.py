@@ -0,0 +1,58 @@
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from .models import Author, Book
+from .serializers import AuthorSerializer, BookSerializer, FastAuthorSerializer, FastBookSerializer
+
+
+class FastSerializerEquivalenceTestCase(TestCase):
+    """
+    The ``.values()``-based serializers must render byte-for-byte what the
+    ModelSerializers they mirror render.
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.authors = [
+            Author.objects.create(name='J.K. Rowling'),
+            Author.objects.create(name='Gabriel García Márquez'),
+            Author.objects.create(name='No Books Yet'),
+        ]
+        titles = ['Harry Potter', 'Cien años de soledad', 'A   separated title', 'Animal Farm']
+        for i, title in enumerate(titles):
+            Book.objects.create(title=title, publication_year=1950 + i * 10, author=self.authors[i % 2])
+        # Same year as another book: ordering falls through to the title.
+        Book.objects.create(title='Another', publication_year=1950, author=self.authors[0])
+    
+    def render(self, data):
+        return JSONRenderer().render(data)
+    
+    def test_books(self):
+        books = Book.objects.all()
+        self.assertEqual(
+            self.render(FastBookSerializer().serialize(books)),
+            self.render(BookSerializer(books, many=True).data)
+        )
+    
+    def test_authors_with_nested_books(self):
+        authors = Author.objects.order_by('id')
+        self.assertEqual(
+            self.render(FastAuthorSerializer().serialize(authors)),
+            self.render(AuthorSerializer(authors, many=True).data)
+        )
+    
+    def test_empty(self):
+        self.assertEqual(FastAuthorSerializer().serialize(Author.objects.none()), [])
+    
+    def test_book_list_endpoint(self):
+        books = Book.objects.all()
+        cases = [
+            ('', books.order_by('title')),
+            ('?ordering=-publication_year', books.order_by('-publication_year')),
+            ('?search=potter', books.filter(title__icontains='potter').order_by('title')),
+            (f'?author={self.authors[1].id}', books.filter(author=self.authors[1]).order_by('title')),
+        ]
+        for params, queryset in cases:
+            response = self.client.get(f'/api/books/{params}')
+            expected = BookSerializer(queryset, many=True).data
+            self.assertEqual(self.render(response.data['results']), self.render(expected), params)
@@ -2,8 +2,9 @@ from rest_framework import generics
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from django_filters import rest_framework
 from rest_framework import filters
+from rest_framework.response import Response
 from .models import Book
-from .serializers import BookSerializer
+from .serializers import BookSerializer, FastBookSerializer
 
 class ListView(generics.ListAPIView):
     queryset = Book.objects.all()
@@ -14,6 +15,18 @@ class ListView(generics.ListAPIView):
     search_fields = ['title', 'author__name']
     ordering_fields = ['title', 'publication_year', 'author__name']
     ordering = ['title']
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List books through FastBookSerializer: same output as BookSerializer,
+        built from ``.values()`` rows instead of model instances.
+        """
+        serializer = FastBookSerializer(context=self.get_serializer_context())
+        queryset = serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize_rows(page))
+        return Response(serializer.serialize_rows(queryset))
 
 class DetailView(generics.RetrieveAPIView):
     queryset = Book.objects.all()
@@ -0,0 +1,66 @@
+"""
+Compare JSON rendering of BookSerializer payloads with DRF's JSONRenderer
+(stdlib json) and api.renderers.ORJSONRenderer.
+
+Books are built in memory (no database), serialized once, and each
+renderer is timed on the resulting data. Reported times are per 1000 objects.
+
+Usage (from the advanced-api-project directory):
+
+    python benchmarks/bench_renderers.py --objects 1000 --repeat 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'advanced_api_project.settings')
+
+
+def build_payloads(count):
+    from api.models import Book
+    from api.serializers import BookSerializer
+    
+    books = [
+        Book(id=i + 1, title=f'Book title number {i}', publication_year=1900 + i % 120, author_id=i % 50 + 1)
+        for i in range(count)
+    ]
+    return {'BookSerializer': BookSerializer(books, many=True).data}
+
+
+def timed(render, data, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(data)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--objects', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    
+    import django
+    django.setup()
+    
+    from rest_framework.renderers import JSONRenderer
+    from api import renderers
+    
+    print(f'orjson {"installed" if renderers.orjson else "NOT installed (fallback)"}')
+    print(f"{'payload':<18}{'JSONRenderer (ms)':>20}{'ORJSONRenderer (ms)':>22}{'speedup':>10}")
+    scale = 1000 / args.objects * 1000
+    for name, data in build_payloads(args.objects).items():
+        assert renderers.ORJSONRenderer().render(data) == JSONRenderer().render(data), name
+        stdlib = timed(JSONRenderer().render, data, args.repeat) * scale
+        fast = timed(renderers.ORJSONRenderer().render, data, args.repeat) * scale
+        print(f'{name:<18}{stdlib:>20.3f}{fast:>22.3f}{stdlib / fast:>9.1f}x')
+    print('(times per 1000 objects)')
+
+
+if __name__ == '__main__':
+    main()
@@ -336,6 +336,18 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Stream every upload to a temporary file in chunks instead of holding small
+# ones in memory.
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+
+# Profile photos: after an upload commits, PROFILE_PHOTO_WORKERS threads write
+# square, metadata-free thumbnails of each size in each format (see
+# bookshelf.images). Set PROFILE_PHOTO_ASYNC = False to make them inline.
+PROFILE_PHOTO_ASYNC = True
+PROFILE_PHOTO_WORKERS = 2
+PROFILE_PHOTO_SIZES = (64, 128, 256, 512)
+PROFILE_PHOTO_FORMATS = ('webp', 'jpeg')
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
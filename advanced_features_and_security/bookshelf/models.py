@@ -38,9 +38,19 @@ class CustomUser(AbstractUser):
     # Add custom fields
     date_of_birth = models.DateField(null=True, blank=True)
     profile_photo = models.ImageField(upload_to='profile_photos/', null=True, blank=True)
+    # Resized, metadata-free copies of profile_photo as
+    # {size: {format: storage name}}, written by bookshelf.images.
+    profile_photo_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     objects = CustomUserManager()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets bookshelf.signals tell whether a save replaced the photo.
+        instance._loaded_profile_photo = instance.__dict__.get('profile_photo')
+        return instance
+
     def __str__(self):
         return self.username
 
@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from . import images
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+def profile_photo_saved(sender, instance, raw=False, **kwargs):
+    if raw or 'profile_photo' not in instance.__dict__:
+        # Fixtures, or a save with the photo deferred (so unchanged).
+        return
+    name = instance.profile_photo.name or ''
+    if name == (getattr(instance, '_loaded_profile_photo', None) or ''):
+        return
+    instance._loaded_profile_photo = name
+    stale = instance.profile_photo_variants
+    if stale:
+        instance.profile_photo_variants = {}
+        CustomUser.objects.filter(pk=instance.pk).update(profile_photo_variants={})
+        transaction.on_commit(lambda: images.delete_variants(stale))
+    if name:
+        transaction.on_commit(lambda: images.schedule(instance.pk, name))
@@ -1,3 +1,51 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import BytesIO
 
-# Create your tests here.
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from .models import CustomUser
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, PROFILE_PHOTO_ASYNC=False)
+class ProfilePhotoTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def make_photo(self):
+        exif = Image.Exif()
+        exif[0x010F] = 'CameraMaker'  # Make
+        buffer = BytesIO()
+        Image.new('RGB', (640, 480), 'blue').save(buffer, 'JPEG', exif=exif.tobytes())
+        return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+    def test_variants_are_written_without_metadata(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = CustomUser.objects.create_user('reader', 'reader@example.com', profile_photo=self.make_photo())
+        user.refresh_from_db()
+        name = user.profile_photo_variants['128']['jpeg']
+        with default_storage.open(name) as file:
+            image = Image.open(file)
+            self.assertEqual(image.size, (128, 128))
+            self.assertFalse(image.getexif())
+
+        response = self.client.get(f'/bookshelf/users/{user.pk}/photo/?size=100', HTTP_ACCEPT='image/webp')
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].endswith(user.profile_photo_variants['128']['webp']))
+
+    def test_original_is_never_redirected_to(self):
+        with self.settings(PROFILE_PHOTO_ASYNC=True), self.captureOnCommitCallbacks(execute=False):
+            user = CustomUser.objects.create_user('pending', 'pending@example.com', profile_photo=self.make_photo())
+        user.refresh_from_db()
+        self.assertTrue(user.profile_photo)
+        self.assertEqual(user.profile_photo_variants, {})
+        response = self.client.get(f'/bookshelf/users/{user.pk}/photo/')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('Location', response)
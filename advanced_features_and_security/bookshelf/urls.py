@@ -12,4 +12,5 @@ urlpatterns = [
     path('books/<int:book_id>/', views.book_detail, name='book_detail'),
     path('dashboard/', views.dashboard, name='dashboard'),
     path('admin-view/', views.admin_view, name='admin_view'),
+    path('users/<int:user_id>/photo/', views.profile_photo, name='profile_photo'),
 ]
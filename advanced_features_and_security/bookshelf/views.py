@@ -1,5 +1,8 @@
-from django.http import HttpResponse
-from django.shortcuts import render
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseRedirect
+from django.shortcuts import get_object_or_404, render
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from . import images
+from .models import CustomUser
 
 def book_list(request):
     return HttpResponse("Book list - placeholder")
@@ -24,3 +27,25 @@ def dashboard(request):
 
 def admin_view(request):
     return HttpResponse("Admin view - placeholder")
+
+def profile_photo(request, user_id):
+    """
+    Redirect to the smallest variant of the user's photo at least ``?size=``
+    pixels wide (the largest without it), in WebP when the client accepts it.
+    """
+    try:
+        size = int(request.GET['size']) if 'size' in request.GET else None
+    except ValueError:
+        return HttpResponseBadRequest("size must be a number of pixels")
+    user = get_object_or_404(CustomUser.objects.only('profile_photo', 'profile_photo_variants'), pk=user_id)
+    accepts_webp = 'image/webp' in request.headers.get('Accept', '')
+    formats = [fmt for fmt in images.get_formats() if fmt != 'webp' or accepts_webp]
+    url = images.variant_url(user, size, formats)
+    if url is None:
+        if user.profile_photo:
+            raise Http404("This profile photo is still being processed")
+        raise Http404("This user has no profile photo")
+    response = HttpResponseRedirect(url)
+    patch_vary_headers(response, ['Accept'])
+    patch_cache_control(response, public=True, max_age=300)
+    return response
@@ -0,0 +1,150 @@
+"""
+Token authentication with cached token -> user resolution.
+
+Lookups go through two tiers: a small process-local LRU with a short TTL and
+the shared Django cache (``TOKEN_AUTH_CACHE_ALIAS``). Only on a miss in both
+does the request hit the ``authtoken_token`` / user join. Token deletion and
+user changes clear the shared entries and this process's local entries;
+other processes may keep serving a stale local entry for at most
+``TOKEN_AUTH_LOCAL_CACHE_TIMEOUT`` seconds.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+
+class LocalLRUCache:
+    """
+    Thread-safe, size-bounded LRU mapping whose entries expire after ``timeout`` seconds.
+    """
+    
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TokenUserCache:
+    """
+    Maps token keys to user ids and user ids to user objects, so a user
+    can be invalidated without knowing their token keys.
+    """
+    
+    def __init__(self):
+        self.local = LocalLRUCache(
+            getattr(settings, 'TOKEN_AUTH_LOCAL_CACHE_SIZE', 10000),
+            getattr(settings, 'TOKEN_AUTH_LOCAL_CACHE_TIMEOUT', 30),
+        )
+    
+    @property
+    def shared(self):
+        return caches[getattr(settings, 'TOKEN_AUTH_CACHE_ALIAS', 'default')]
+    
+    @property
+    def timeout(self):
+        return getattr(settings, 'TOKEN_AUTH_CACHE_TIMEOUT', 300)
+    
+    @staticmethod
+    def token_cache_key(key):
+        # Never store raw token keys in a shared cache.
+        return 'authtoken:token:' + hashlib.sha256(key.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def user_cache_key(user_id):
+        return f'authtoken:user:{user_id}'
+    
+    def _get(self, cache_key):
+        value = self.local.get(cache_key)
+        if value is None:
+            value = self.shared.get(cache_key)
+            if value is not None:
+                self.local.set(cache_key, value)
+        return value
+    
+    def _set(self, cache_key, value):
+        self.shared.set(cache_key, value, self.timeout)
+        self.local.set(cache_key, value)
+    
+    def _delete(self, cache_key):
+        self.shared.delete(cache_key)
+        self.local.delete(cache_key)
+    
+    def get(self, key):
+        user_id = self._get(self.token_cache_key(key))
+        if user_id is None:
+            return None
+        user = self._get(self.user_cache_key(user_id))
+        # Hand out a copy so per-request mutations never leak into the cache.
+        return copy.copy(user) if user is not None else None
+    
+    def set(self, key, user):
+        self._set(self.user_cache_key(user.pk), copy.copy(user))
+        self._set(self.token_cache_key(key), user.pk)
+    
+    def invalidate_token(self, key):
+        self._delete(self.token_cache_key(key))
+    
+    def invalidate_user(self, user_id):
+        self._delete(self.user_cache_key(user_id))
+    
+    def clear(self):
+        self.local.clear()
+
+
+token_cache = TokenUserCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for ``TokenAuthentication`` that resolves tokens
+    through ``token_cache`` before falling back to the database.
+    """
+    
+    def authenticate_credentials(self, key):
+        user = token_cache.get(key)
+        if user is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, user)
+            return (user, token)
+        
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        # The token row is not loaded on a cache hit; views only need its key.
+        token = self.get_model()(key=key, user=user)
+        return (user, token)
@@ -56,10 +56,9 @@ class PostForm(forms.ModelForm):
         post = super().save(commit=False)
         if commit:
             post.save()
-            # Save tags using django-taggit
-            tag_names = self.cleaned_data.get('tags', [])
-            if tag_names:
-                post.tags.set(*tag_names)
+            # Saves tags with post.tags.set(), which only adds and removes the
+            # tags that changed (an empty field removes them all);
+            # blog.signals updates the tag counts from it.
             self.save_m2m()
         return post
 
@@ -0,0 +1,93 @@
+"""
+Rendered-fragment cache for post detail pages.
+
+The post body is cached by ``{% cache %}`` in ``post_detail.html`` under the
+post's id and ``updated_date``; tag changes, which do not touch the post
+row, delete that fragment (``blog.signals``). Comments are cached a page
+(see ``blog.pagination``) at a time as rendered ``comment_item.html``
+fragments under the post's comment version: the latest ``updated_at`` and
+the number of comments, itself cached and dropped whenever a comment is
+saved or deleted. Anything depending on the viewer (edit/delete links, the
+comment form and its CSRF token) is rendered around the cached fragments,
+never inside them. Author renames show up once the fragments expire after
+``BLOG_FRAGMENT_CACHE_TIMEOUT`` seconds.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models import Count, Max
+from django.template.loader import render_to_string
+
+from . import pagination
+
+BODY_FRAGMENT = 'post_body'
+COMMENTS_VERSION_KEY = 'blog:post:{}:comments:version'
+COMMENTS_KEY = 'blog:post:{}:comments:{}:page:{}'
+
+
+def get_timeout():
+    return getattr(settings, 'BLOG_FRAGMENT_CACHE_TIMEOUT', 600)
+
+
+def invalidate_body(post):
+    """
+    Drop the cached body of ``post``, as of both the instance and the stored
+    row (the instance may predate the last save).
+    """
+    stored = type(post).objects.filter(pk=post.pk).values_list('updated_date', flat=True).first()
+    versions = {post.updated_date} | ({stored} if stored else set())
+    cache.delete_many([
+        make_template_fragment_key(BODY_FRAGMENT, [post.pk, version.isoformat()]) for version in versions
+    ])
+
+
+def get_comments_state(post):
+    """
+    Return (version, number of comments) of the post's comments.
+    """
+    key = COMMENTS_VERSION_KEY.format(post.pk)
+    state = cache.get(key)
+    if state is None:
+        aggregate = post.comments.aggregate(last=Max('updated_at'), count=Count('id'))
+        last = aggregate['last'].isoformat() if aggregate['last'] else ''
+        state = (f"{last}:{aggregate['count']}", aggregate['count'])
+        cache.set(key, state, get_timeout())
+    return state
+
+
+def invalidate_comments(post_id):
+    cache.delete(COMMENTS_VERSION_KEY.format(post_id))
+
+
+def get_comment_page(post, cursor=None):
+    """
+    Return the page of the post's comments after ``cursor`` (newest first),
+    as a dict of ``comments`` (dicts with ``pk``, ``author_id`` and the
+    rendered ``html``), ``next_cursor`` and the total ``count``.
+    """
+    # Keyed on the decoded position rather than the client's string, so
+    # equivalent cursors share an entry and keys have a bounded length.
+    after = pagination.decode_comment_cursor(cursor) if cursor else None
+    position = hashlib.sha256(repr(after).encode()).hexdigest() if after else 'first'
+    version, count = get_comments_state(post)
+    key = COMMENTS_KEY.format(post.pk, version, position)
+    page = cache.get(key)
+    if page is None:
+        comments, next_cursor = pagination.paginate_comments(
+            post.comments.select_related('author'), after
+        )
+        page = {
+            'comments': [
+                {
+                    'pk': comment.pk,
+                    'author_id': comment.author_id,
+                    'html': render_to_string('blog/comment_item.html', {'comment': comment}),
+                }
+                for comment in comments
+            ],
+            'next_cursor': next_cursor,
+        }
+        cache.set(key, page, get_timeout())
+    return {**page, 'count': count}
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from blog import search
+
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    search.create_index(schema_editor)
+    Post = apps.get_model('blog', 'Post')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    content_type = ContentType.objects.filter(app_label='blog', model='post').first()
+    tags = {}
+    if content_type is not None:
+        for post_id, name in TaggedItem.objects.filter(content_type=content_type).values_list('object_id', 'tag__name'):
+            tags.setdefault(post_id, []).append(name)
+    schema_editor.connection.cursor().executemany(
+        f'INSERT INTO {search.TABLE}(rowid, title, content, tags) VALUES (%s, %s, %s, %s)',
+        [
+            (post_id, title, content, ' '.join(tags.get(post_id, [])))
+            for post_id, title, content in Post.objects.values_list('id', 'title', 'content').iterator()
+        ],
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    from blog import search
+
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {search.TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_tagcount'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -3,6 +3,7 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 from django.urls import reverse
 from taggit.managers import TaggableManager  # Import from django-taggit
+from taggit.models import Tag
 
 class Post(models.Model):
     title = models.CharField(max_length=200)
@@ -25,7 +26,7 @@ class Post(models.Model):
         return reverse('post-detail', kwargs={'pk': self.pk})
     
     def get_tags_display(self):
-        """Return tags as comma-separated string"""
+        """Return tags as comma-separated string (no query when tags are prefetched)"""
         return ', '.join([tag.name for tag in self.tags.all()])
 
 class Comment(models.Model):
@@ -39,4 +40,22 @@ class Comment(models.Model):
         return f'Comment by {self.author} on {self.post}'
     
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # A post's comments newest first, for cursor pagination.
+            models.Index(fields=['post', '-created_at', '-id'], name='blog_comment_post_created_idx'),
+        ]
+
+class TagCount(models.Model):
+    """Number of posts carrying a tag, kept up to date by blog.signals."""
+    tag = models.OneToOneField(Tag, on_delete=models.CASCADE, primary_key=True, related_name='post_count')
+    count = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return f'{self.tag_id}: {self.count}'
+    
+    class Meta:
+        indexes = [
+            # Most popular tags first, for the tag cloud.
+            models.Index(fields=['-count'], name='blog_tagcount_count_idx'),
+        ]
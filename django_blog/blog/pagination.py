@@ -0,0 +1,75 @@
+"""
+Cursor (keyset) pagination.
+
+A page ends with a cursor encoding the sort key of its last row, and the
+next page is the rows strictly after that position, read from an index
+where one covers the ordering. Unlike page numbers, the cost does not grow
+with the depth of the page, no total count is needed, and rows added
+meanwhile do not shift later pages.
+
+Comments are listed newest first (``Comment.Meta.ordering``), with the id
+breaking ties between comments created at the same instant, from the
+``blog_comment_post_created_idx`` index. Search results use the same
+cursors over their rank (see ``blog.search``).
+"""
+import base64
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import BadRequest
+from django.db.models import Q
+
+
+def get_page_size():
+    return getattr(settings, 'BLOG_COMMENTS_PAGE_SIZE', 20)
+
+
+def encode_cursor(*values):
+    position = '|'.join(value.isoformat() if isinstance(value, datetime) else str(value) for value in values)
+    return base64.urlsafe_b64encode(position.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, *types):
+    """
+    Return the values in ``cursor``, converted by ``types`` in order; raises
+    ``BadRequest`` when it was not made by ``encode_cursor`` with as many values.
+    """
+    try:
+        position = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        values = position.split('|')
+        if len(values) != len(types):
+            raise ValueError
+        return tuple(convert(value) for convert, value in zip(types, values))
+    except (ValueError, UnicodeDecodeError):
+        raise BadRequest('Invalid cursor')
+
+
+def decode_comment_cursor(cursor):
+    return decode_cursor(cursor, datetime.fromisoformat, int)
+
+
+def paginate(queryset, page_size, cursor_of):
+    """
+    Return (rows, next cursor or None) for the first ``page_size`` rows of
+    ``queryset``, which should already start after the previous cursor.
+    """
+    # One extra row tells whether there is a next page.
+    rows = list(queryset[:page_size + 1])
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, cursor_of(rows[-1])
+    return rows, None
+
+
+def paginate_comments(queryset, after=None, page_size=None):
+    """
+    Return (comments, next cursor or None) for the page of ``queryset`` after
+    ``after``, a (created_at, id) position from ``decode_comment_cursor``.
+    """
+    queryset = queryset.order_by('-created_at', '-pk')
+    if after:
+        created_at, pk = after
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    return paginate(
+        queryset, page_size or get_page_size(), lambda comment: encode_cursor(comment.created_at, comment.pk)
+    )
@@ -0,0 +1,156 @@
+"""
+Full-text post search.
+
+On SQLite, posts are indexed in an FTS5 table (``blog_post_fts``) holding
+each post's title, content and tag names under the post's id. The index is
+kept current by ``blog.signals`` as posts are saved, retagged and deleted,
+so a search reads the inverted index instead of scanning posts. Every query
+term must match, as a prefix (``djan`` finds ``django``). Results are ranked
+by BM25 with per-field weights (``BLOG_SEARCH_WEIGHTS``); ``search_in``
+restricts matching to one field. Each result carries a ``search_snippet``
+with the matches wrapped in ``<mark>``.
+
+Other databases fall back to substring matching without snippets.
+"""
+import re
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField, Q, TextField
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from . import pagination
+
+TABLE = 'blog_post_fts'
+FIELDS = ('title', 'content', 'tags')
+MAX_SEARCH_TERMS = 8
+# Match delimiters for snippet(); they are stripped from indexed text (see
+# clean) and swapped for <mark> tags after escaping.
+MARK_START, MARK_END = '\x02', '\x03'
+
+
+def get_weights():
+    weights = getattr(settings, 'BLOG_SEARCH_WEIGHTS', {'title': 10.0, 'content': 1.0, 'tags': 5.0})
+    return [float(weights[field]) for field in FIELDS]
+
+
+def get_search_terms(query):
+    return re.findall(r'\w+', query.lower())[:MAX_SEARCH_TERMS]
+
+
+def is_supported():
+    return connection.vendor == 'sqlite'
+
+
+def create_index(schema_editor):
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+        "title, content, tags, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+
+
+def clean(text):
+    """
+    Drop the snippet match delimiters from indexed text, so that every one
+    in a snippet comes from snippet() and the <mark> tags stay balanced.
+    """
+    return text.replace(MARK_START, '').replace(MARK_END, '')
+
+
+def index_posts(posts):
+    """
+    (Re)index ``posts``; their tags should be prefetched.
+    """
+    if not is_supported():
+        return
+    rows = [
+        (post.pk, clean(post.title), clean(post.content), clean(' '.join(tag.name for tag in post.tags.all())))
+        for post in posts
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+        cursor.executemany(f'INSERT INTO {TABLE}(rowid, title, content, tags) VALUES (%s, %s, %s, %s)', rows)
+
+
+def unindex_post(post_id):
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [post_id])
+
+
+def highlight(snippet):
+    """
+    Escape a raw FTS snippet and turn its match delimiters into ``<mark>``.
+    """
+    if snippet is None:
+        return None
+    html = escape(snippet).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+    return mark_safe(html)
+
+
+def search(queryset, query, search_in='all', after=None):
+    """
+    Restrict ``queryset`` to posts matching ``query`` in ``search_in`` (a
+    ``SearchForm`` choice), best matches first, annotated with
+    ``search_rank`` and ``search_snippet`` (raw; see ``highlight``). With
+    ``after``, a (rank, published date, id) position from ``decode_cursor``,
+    only the results following it are returned.
+    """
+    terms = get_search_terms(query)
+    if not terms:
+        return queryset.none()
+    fields = FIELDS if search_in not in FIELDS else (search_in,)
+    if not is_supported():
+        lookups = {'title': 'title__icontains', 'content': 'content__icontains', 'tags': 'tags__name__icontains'}
+        for term in terms:
+            condition = Q()
+            for field in fields:
+                condition |= Q(**{lookups[field]: term})
+            queryset = queryset.filter(condition)
+        queryset = queryset.distinct().annotate(
+            search_rank=RawSQL('0', [], output_field=FloatField()),
+            search_snippet=RawSQL('NULL', [], output_field=TextField()),
+        )
+    else:
+        column = '' if search_in not in FIELDS else f'{search_in} : '
+        match = ' '.join(f'{column}"{term}"*' for term in terms)
+        snippet_column = -1 if search_in not in FIELDS else FIELDS.index(search_in)
+        weights = ', '.join(str(weight) for weight in get_weights())
+        queryset = queryset.extra(
+            tables=[TABLE],
+            where=[f'{TABLE}.rowid = blog_post.id', f'{TABLE} MATCH %s'],
+            params=[match],
+        ).annotate(
+            search_rank=RawSQL(f'-bm25({TABLE}, {weights})', [], output_field=FloatField()),
+            search_snippet=RawSQL(
+                f"snippet({TABLE}, {snippet_column}, char(2), char(3), '…', 16)", [], output_field=TextField()
+            ),
+        )
+    if after is not None:
+        rank, published_date, pk = after
+        queryset = queryset.filter(
+            Q(search_rank__lt=rank)
+            | Q(search_rank=rank, published_date__lt=published_date)
+            | Q(search_rank=rank, published_date=published_date, pk__lt=pk)
+        )
+    return queryset.order_by('-search_rank', '-published_date', '-pk')
+
+
+def decode_cursor(cursor):
+    return pagination.decode_cursor(cursor, float, datetime.fromisoformat, int)
+
+
+def paginate(results):
+    """
+    Return (posts, next cursor or None) for the first page of ``search``
+    results. Later pages pass the decoded cursor to ``search`` as ``after``,
+    so no page counts or skips over every match.
+    """
+    return pagination.paginate(
+        results, getattr(settings, 'BLOG_SEARCH_PAGE_SIZE', 10),
+        lambda post: pagination.encode_cursor(post.search_rank, post.published_date, post.pk),
+    )
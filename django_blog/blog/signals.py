@@ -0,0 +1,50 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from taggit.models import TaggedItem
+from . import fragments, search, tag_cloud
+from .models import Comment, Post
+
+
+@receiver(m2m_changed, sender=TaggedItem)
+def post_tags_changed(sender, instance, action, pk_set, **kwargs):
+    # post.tags.set() (PostForm.save) reports only the tags actually added
+    # and removed; clear() reports none, so they are read beforehand.
+    if not isinstance(instance, Post):
+        return
+    if action == 'post_add':
+        tag_cloud.adjust(pk_set, 1)
+    elif action == 'post_remove':
+        tag_cloud.adjust(pk_set, -1)
+    elif action == 'pre_clear':
+        instance._cleared_tag_ids = set(instance.tags.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        tag_cloud.adjust(getattr(instance, '_cleared_tag_ids', None), -1)
+    if action == 'post_clear' or (action in ('post_add', 'post_remove') and pk_set):
+        search.index_posts([instance])
+        fragments.invalidate_body(instance)
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    # Tagged items are deleted with the post, without m2m_changed.
+    tag_cloud.adjust(set(instance.tags.values_list('pk', flat=True)), -1)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_posts([instance])
+
+
+@receiver(post_delete, sender=Post)
+def post_unindexed(sender, instance, **kwargs):
+    search.unindex_post(instance.pk)
+    fragments.invalidate_body(instance)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comments_changed(sender, instance, **kwargs):
+    # Covers CommentCreateView, CommentUpdateView and CommentDeleteView
+    # (and admin edits); the next detail view renders the comments afresh.
+    fragments.invalidate_comments(instance.post_id)
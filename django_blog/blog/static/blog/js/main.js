@@ -23,4 +23,25 @@ document.addEventListener('DOMContentLoaded', function() {
             }, 150);
         });
     });
-});
\ No newline at end of file
+});
+// Load further pages of comments in place on post detail pages
+document.addEventListener('click', function(e) {
+    const link = e.target.closest('.load-more-comments');
+    if (!link) {
+        return;
+    }
+    e.preventDefault();
+    const url = link.dataset.url + '?cursor=' + encodeURIComponent(link.dataset.cursor);
+    fetch(url, {headers: {'Accept': 'application/json'}})
+        .then(response => response.json())
+        .then(page => {
+            const list = document.getElementById('comment-list');
+            page.comments.forEach(comment => list.insertAdjacentHTML('beforeend', comment.html));
+            if (page.next_cursor) {
+                link.dataset.cursor = page.next_cursor;
+                link.href = '?cursor=' + encodeURIComponent(page.next_cursor);
+            } else {
+                link.remove();
+            }
+        });
+});
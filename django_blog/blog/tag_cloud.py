@@ -0,0 +1,47 @@
+"""
+Popular tags for the home page.
+
+``TagCount`` holds the number of posts per tag. It is adjusted by
+``blog.signals`` whenever a post's tags change or a post is deleted, so the
+cloud is read with an indexed top-N query instead of counting the whole
+tagged-item table. The result is cached for ``BLOG_TAG_CLOUD_TIMEOUT``
+seconds and dropped on every change.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.functions import Greatest
+from .models import TagCount
+
+CACHE_KEY = 'blog:tag_cloud'
+
+
+def get_cloud_size():
+    return getattr(settings, 'BLOG_TAG_CLOUD_SIZE', 10)
+
+
+def get_tag_cloud():
+    """
+    Return the most used tags as dicts with ``name``, ``slug`` and ``num_times``.
+    """
+    cloud = cache.get(CACHE_KEY)
+    if cloud is None:
+        counts = TagCount.objects.filter(count__gt=0).order_by('-count', 'tag__name')[:get_cloud_size()]
+        cloud = [
+            {'name': name, 'slug': slug, 'num_times': count}
+            for name, slug, count in counts.values_list('tag__name', 'tag__slug', 'count')
+        ]
+        cache.set(CACHE_KEY, cloud, getattr(settings, 'BLOG_TAG_CLOUD_TIMEOUT', 300))
+    return cloud
+
+
+def adjust(tag_ids, delta):
+    """
+    Add ``delta`` to the post count of each tag in ``tag_ids``.
+    """
+    if not tag_ids:
+        return
+    if delta > 0:
+        TagCount.objects.bulk_create([TagCount(tag_id=tag_id) for tag_id in tag_ids], ignore_conflicts=True)
+    TagCount.objects.filter(tag_id__in=tag_ids).update(count=Greatest(F('count') + delta, 0))
+    cache.delete(CACHE_KEY)
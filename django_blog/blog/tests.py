@@ -1,3 +1,295 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from .forms import PostForm
+from .models import Comment, Post, TagCount
+from .tag_cloud import get_tag_cloud
 
-# Create your tests here.
+
+class TagCloudTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create(username='author')
+
+    def save_post(self, tags, instance=None):
+        form = PostForm(data={'title': 'Post', 'content': 'Body', 'tags': tags}, instance=instance)
+        self.assertTrue(form.is_valid(), form.errors)
+        post = form.save(commit=False)
+        post.author = self.author
+        post.save()
+        form.save_m2m()
+        return post
+
+    def counts(self):
+        return dict(TagCount.objects.values_list('tag__name', 'count'))
+
+    def test_counts_follow_tag_changes(self):
+        first = self.save_post('django, python')
+        self.save_post('python')
+        self.assertEqual(self.counts(), {'django': 1, 'python': 2})
+
+        self.save_post('python, web', instance=first)
+        self.assertEqual(self.counts(), {'django': 0, 'python': 2, 'web': 1})
+
+        first.delete()
+        self.assertEqual(self.counts(), {'django': 0, 'python': 1, 'web': 0})
+
+    def test_empty_tags_field_clears_tags(self):
+        # Submitting the form with no tags removes them all, as the field shows.
+        post = self.save_post('django, python')
+        self.save_post('', instance=post)
+        self.assertEqual(list(post.tags.all()), [])
+        self.assertEqual(self.counts(), {'django': 0, 'python': 0})
+
+    def test_cloud_is_cached_and_invalidated(self):
+        self.save_post('django, python')
+        self.save_post('python')
+        self.assertEqual([tag['name'] for tag in get_tag_cloud()], ['python', 'django'])
+        with self.assertNumQueries(0):
+            get_tag_cloud()
+        self.save_post('django')
+        self.assertEqual(get_tag_cloud()[0], {'name': 'django', 'slug': 'django', 'num_times': 2})
+
+    def test_home_does_not_count_tagged_items(self):
+        self.save_post('django')
+        get_tag_cloud()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['popular_tags'][0]['name'], 'django')
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create(username='author')
+
+    def create_post(self, title, content, tags=()):
+        post = Post.objects.create(author=self.author, title=title, content=content)
+        if tags:
+            post.tags.add(*tags)
+        return post
+
+    def search(self, query, search_in='all', cursor=''):
+        response = self.client.get(reverse('search'), {'query': query, 'search_in': search_in, 'cursor': cursor})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def titles(self, response):
+        return [post.title for post in response.context['posts']]
+
+    def test_ranking_follows_field_weights(self):
+        self.create_post('Cooking', 'A django recipe in the body.')
+        self.create_post('Django tips', 'Nothing else here.')
+        self.create_post('Gardening', 'Soil.', tags=['django'])
+        self.assertEqual(self.titles(self.search('djan')), ['Django tips', 'Gardening', 'Cooking'])
+
+    def test_search_in_restricts_fields(self):
+        self.create_post('Django tips', 'Body.')
+        self.create_post('Gardening', 'Soil.', tags=['django'])
+        self.assertEqual(self.titles(self.search('django', 'title')), ['Django tips'])
+        self.assertEqual(self.titles(self.search('django', 'tags')), ['Gardening'])
+        self.assertEqual(self.titles(self.search('django', 'content')), [])
+
+    def test_index_follows_edits_and_deletes(self):
+        post = self.create_post('Old title', 'Body.')
+        post.title = 'New title'
+        post.save()
+        self.assertEqual(self.titles(self.search('old')), [])
+        self.assertEqual(self.titles(self.search('new')), ['New title'])
+        post.tags.add('python')
+        self.assertEqual(self.titles(self.search('python', 'tags')), ['New title'])
+        post.delete()
+        self.assertEqual(self.titles(self.search('new')), [])
+
+    def test_snippets_are_escaped_and_highlighted(self):
+        self.create_post('Post', 'Intro <script>alert(1)</script> about django forms.')
+        snippet = self.search('django', 'content').context['posts'][0].search_snippet
+        self.assertIn('<mark>django</mark>', snippet)
+        self.assertIn('&lt;script&gt;', snippet)
+
+    def test_snippet_marks_stay_balanced(self):
+        self.create_post('Post', 'Stray \x03 and \x02 markers about django.')
+        snippet = self.search('django', 'content').context['posts'][0].search_snippet
+        self.assertEqual(snippet.count('<mark>'), snippet.count('</mark>'))
+
+    def test_results_are_paginated_by_cursor(self):
+        for i in range(12):
+            self.create_post(f'Django {i}', 'Body.')
+        first = self.search('django')
+        self.assertEqual(len(first.context['posts']), 10)
+        second = self.search('django', cursor=first.context['next_cursor'])
+        self.assertEqual(len(second.context['posts']), 2)
+        self.assertIsNone(second.context['next_cursor'])
+        titles = self.titles(first) + self.titles(second)
+        self.assertEqual(sorted(titles), sorted(f'Django {i}' for i in range(12)))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('search'), {'query': 'django', 'cursor': 'nonsense'})
+        self.assertEqual(response.status_code, 400)
+
+
+class ListQueryCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def create_posts(self, count):
+        for i in range(count):
+            author = User.objects.create(username=f'author{Post.objects.count()}')
+            post = Post.objects.create(author=author, title=f'Django {i}', content='Body.')
+            post.tags.add('django', f'extra{i}')
+
+    def count_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        for post in response.context['posts']:
+            post.get_tags_display()
+        return len(queries)
+
+    def assertConstantQueries(self, url, params=None):
+        self.create_posts(2)
+        few = self.count_queries(url, params)
+        self.create_posts(8)
+        self.assertEqual(self.count_queries(url, params), few)
+
+    def test_post_list(self):
+        self.assertConstantQueries(reverse('post-list'))
+
+    def test_posts_by_tag(self):
+        self.assertConstantQueries(reverse('posts-by-tag', kwargs={'tag_slug': 'django'}))
+
+    def test_search(self):
+        self.assertConstantQueries(reverse('search'), {'query': 'django'})
+
+
+class PostDetailFragmentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author', password='pass')
+        self.reader = User.objects.create_user(username='reader', password='pass')
+        self.post = Post.objects.create(author=self.author, title='Cached post', content='First body.')
+        self.post.tags.add('django')
+        self.url = reverse('post-detail', kwargs={'pk': self.post.pk})
+
+    def comment(self, author, content):
+        return Comment.objects.create(post=self.post, author=author, content=content)
+
+    def test_repeat_view_only_loads_the_post(self):
+        self.comment(self.reader, 'Nice one.')
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertContains(response, 'First body.')
+        self.assertContains(response, 'Nice one.')
+        self.assertEqual(len(queries), 1)
+
+    def test_comment_views_refresh_the_comments(self):
+        self.client.get(self.url)
+        self.client.login(username='reader', password='pass')
+        self.client.post(reverse('comment-create', kwargs={'pk': self.post.pk}), {'content': 'Added.'})
+        self.assertContains(self.client.get(self.url), 'Added.')
+
+        comment = self.post.comments.get()
+        self.client.post(reverse('comment-update', kwargs={'pk': comment.pk}), {'content': 'Edited.'})
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Edited.')
+        self.assertNotContains(response, 'Added.')
+
+        self.client.post(reverse('comment-delete', kwargs={'pk': comment.pk}))
+        self.assertNotContains(self.client.get(self.url), 'Edited.')
+
+    def test_post_edits_refresh_the_body(self):
+        self.client.get(self.url)
+        self.client.login(username='author', password='pass')
+        self.client.post(
+            reverse('post-update', kwargs={'pk': self.post.pk}),
+            {'title': 'Cached post', 'content': 'Second body.', 'tags': 'python'},
+        )
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Second body.')
+        self.assertContains(response, 'python')
+        self.post.tags.set(['flask'])
+        self.assertContains(self.client.get(self.url), 'flask')
+
+    def test_owner_links_are_not_cached(self):
+        self.comment(self.reader, 'Nice one.')
+        self.client.login(username='author', password='pass')
+        response = self.client.get(self.url)
+        self.assertContains(response, reverse('post-update', kwargs={'pk': self.post.pk}))
+        self.assertNotContains(response, 'comment/')
+
+        self.client.login(username='reader', password='pass')
+        response = self.client.get(self.url)
+        self.assertNotContains(response, reverse('post-update', kwargs={'pk': self.post.pk}))
+        self.assertContains(response, reverse('comment-update', kwargs={'pk': self.post.comments.get().pk}))
+        self.assertContains(response, 'csrfmiddlewaretoken')
+
+
+@override_settings(BLOG_COMMENTS_PAGE_SIZE=3)
+class CommentPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='author', password='pass')
+        self.post = Post.objects.create(author=self.author, title='Viral post', content='Body.')
+        self.comments = [
+            Comment.objects.create(post=self.post, author=self.author, content=f'Comment {i}')
+            for i in range(7)
+        ]
+        self.url = reverse('post-detail', kwargs={'pk': self.post.pk})
+        self.json_url = reverse('post-comments', kwargs={'pk': self.post.pk})
+
+    def test_detail_page_shows_newest_page(self):
+        response = self.client.get(self.url)
+        self.assertEqual([c['pk'] for c in response.context['comments']], [c.pk for c in self.comments[:3:-1]])
+        self.assertEqual(response.context['comment_count'], 7)
+        self.assertContains(response, 'Load more comments')
+
+    def test_json_pages_cover_every_comment_once(self):
+        seen = []
+        url = self.json_url
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data['comments']), 3)
+            seen.extend(comment['id'] for comment in data['comments'])
+            url = data['next']
+        self.assertEqual(seen, [c.pk for c in reversed(self.comments)])
+
+    def test_pages_survive_new_comments(self):
+        first = self.client.get(self.json_url).json()
+        Comment.objects.create(post=self.post, author=self.author, content='Late comment')
+        second = self.client.get(first['next']).json()
+        self.assertEqual([c['id'] for c in second['comments']], [c.pk for c in self.comments[3:0:-1]])
+        self.assertEqual(second['count'], 8)
+
+    def test_owner_links_in_json(self):
+        self.client.login(username='author', password='pass')
+        data = self.client.get(self.json_url).json()
+        self.assertIn(reverse('comment-update', kwargs={'pk': data['comments'][0]['id']}), data['comments'][0]['html'])
+
+    def test_equivalent_cursors_share_a_cache_entry(self):
+        cursor = self.client.get(self.json_url).json()['next_cursor']
+        self.client.get(self.json_url, {'cursor': cursor})
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(self.json_url, {'cursor': cursor + '=='}).json()
+        # Only the post itself; the page comes from the cache.
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(data['comments']), 3)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(self.json_url, {'cursor': 'nonsense'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'cursor': 'nonsense'}).status_code, 400)
+
+    def test_detail_queries_do_not_grow_with_comments(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+        cache.clear()
+        for i in range(20):
+            user = User.objects.create(username=f'commenter{i}')
+            Comment.objects.create(post=self.post, author=user, content='More.')
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(self.url)
+        self.assertEqual(len(many), len(few))
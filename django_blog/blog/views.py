@@ -5,19 +5,25 @@ from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy, reverse
-from django.db.models import Q
+from django.core.exceptions import BadRequest
+from django.http import JsonResponse
+from django.template.loader import render_to_string
+from django.utils.http import urlencode
 from taggit.models import Tag  # Import Tag from django-taggit
 from .models import Post, Comment
 from .forms import PostForm, CommentForm, SearchForm
+from . import fragments, search
+from .tag_cloud import get_tag_cloud
+
+def with_list_relations(queryset):
+    """Join post authors and prefetch tags in one query per page."""
+    return queryset.select_related('author').prefetch_related('tags')
 
 def home(request):
     recent_posts = Post.objects.order_by('-published_date')[:5]
     
-    # Get popular tags from django-taggit
-    from taggit.models import Tag
-    popular_tags = Tag.objects.annotate(
-        num_times=models.Count('taggit_taggeditem_items')
-    ).order_by('-num_times')[:10]
+    # Popular tags from the maintained per-tag counts (see blog.tag_cloud)
+    popular_tags = get_tag_cloud()
     
     return render(request, 'blog/home.html', {
         'recent_posts': recent_posts,
@@ -47,14 +53,26 @@ class PostListView(ListView):
     context_object_name = 'posts'
     ordering = ['-published_date']
     paginate_by = 10
+    
+    def get_queryset(self):
+        return with_list_relations(super().get_queryset())
 
 class PostDetailView(DetailView):
     model = Post
     template_name = 'blog/post_detail.html'
     
+    def get_queryset(self):
+        return Post.objects.select_related('author')
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['comments'] = self.object.comments.all()
+        # Pre-rendered comments and the post body come from the fragment
+        # cache; only the per-user links and the form are rendered each time.
+        page = fragments.get_comment_page(self.object, self.request.GET.get('cursor'))
+        context['comments'] = page['comments']
+        context['comment_count'] = page['count']
+        context['next_cursor'] = page['next_cursor']
+        context['fragment_timeout'] = fragments.get_timeout()
         context['form'] = CommentForm()
         return context
 
@@ -139,34 +157,58 @@ class CommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         comment = self.get_object()
         return reverse('post-detail', kwargs={'pk': comment.post.pk})
 
+def post_comments(request, pk):
+    """
+    A page of the post's comments as JSON, for "Load more comments".
+    """
+    post = get_object_or_404(Post, pk=pk)
+    try:
+        page = fragments.get_comment_page(post, request.GET.get('cursor'))
+    except BadRequest as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    next_url = None
+    if page['next_cursor']:
+        next_url = f"{reverse('post-comments', kwargs={'pk': pk})}?{urlencode({'cursor': page['next_cursor']})}"
+    return JsonResponse({
+        'count': page['count'],
+        'comments': [
+            {
+                'id': comment['pk'],
+                'html': render_to_string('blog/comment_card.html', {'comment': comment}, request=request),
+            }
+            for comment in page['comments']
+        ],
+        'next_cursor': page['next_cursor'],
+        'next': next_url,
+    })
+
 # Search and Tag views
 def search_posts(request):
     form = SearchForm(request.GET or None)
-    posts = Post.objects.all()
+    posts = Post.objects.none()
+    cursor = next_cursor = None
     query = ''
     
     if form.is_valid() and form.cleaned_data.get('query'):
         query = form.cleaned_data['query']
-        search_in = form.cleaned_data.get('search_in', 'all')
-        
-        # Build Q objects for search
-        q_objects = Q()
-        
-        if search_in in ['all', 'title']:
-            q_objects |= Q(title__icontains=query)
-        
-        if search_in in ['all', 'content']:
-            q_objects |= Q(content__icontains=query)
-        
-        if search_in in ['all', 'tags']:
-            q_objects |= Q(tags__name__icontains=query)
+        search_in = form.cleaned_data.get('search_in') or 'all'
         
-        posts = posts.filter(q_objects).distinct()
+        # Ranked full-text search over the maintained index (see blog.search),
+        # paged by cursor instead of counting and skipping every match.
+        cursor = request.GET.get('cursor')
+        after = search.decode_cursor(cursor) if cursor else None
+        results = with_list_relations(search.search(Post.objects.all(), query, search_in, after))
+        posts, next_cursor = search.paginate(results)
+        for post in posts:
+            post.search_snippet = search.highlight(post.search_snippet)
     
     return render(request, 'blog/search_results.html', {
         'form': form,
         'posts': posts,
-        'query': query
+        'cursor': cursor,
+        'next_cursor': next_cursor,
+        'query': query,
+        'popular_tags': get_tag_cloud(),
     })
 
 class PostByTagListView(ListView):
@@ -179,7 +221,7 @@ class PostByTagListView(ListView):
         # Get tag from django-taggit
         from taggit.models import Tag
         self.tag = get_object_or_404(Tag, slug=self.kwargs.get('tag_slug'))
-        return Post.objects.filter(tags=self.tag).order_by('-published_date')
+        return with_list_relations(Post.objects.filter(tags=self.tag)).order_by('-published_date')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
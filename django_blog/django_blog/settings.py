@@ -105,5 +105,20 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Taggit settings
 TAGGIT_CASE_INSENSITIVE = True
-TAGGIT_TAGS_FROM_STRING = 'taggit.utils.parse_tags'
-TAGGIT_STRING_FROM_TAGS = 'taggit.utils.join'
\ No newline at end of file
+
+# Home page tag cloud: the BLOG_TAG_CLOUD_SIZE most used tags, read from
+# per-tag post counts and cached for BLOG_TAG_CLOUD_TIMEOUT seconds.
+BLOG_TAG_CLOUD_SIZE = 10
+BLOG_TAG_CLOUD_TIMEOUT = 300
+
+# Post search (see blog.search): BM25 weight of a match in each field, and
+# results per page.
+BLOG_SEARCH_WEIGHTS = {'title': 10.0, 'content': 1.0, 'tags': 5.0}
+BLOG_SEARCH_PAGE_SIZE = 10
+
+# Post detail pages cache their rendered body and comments (see
+# blog.fragments) for at most BLOG_FRAGMENT_CACHE_TIMEOUT seconds.
+BLOG_FRAGMENT_CACHE_TIMEOUT = 600
+
+# Comments shown per page on post detail pages and per "load more" request.
+BLOG_COMMENTS_PAGE_SIZE = 20
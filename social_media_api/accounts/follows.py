@@ -0,0 +1,78 @@
+"""
+Follow graph service.
+
+Follow edges live in ``accounts.Follow``. Membership checks ("does A follow
+B?") are answered from a per-user set of followed ids kept in the shared
+cache under ``follows:following:<user id>``, so checking any number of
+accounts costs one cache read instead of one query per account. Every write
+goes through ``Follow`` rows, whose signal handlers drop the cached set.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from .models import Follow
+
+CACHE_KEY = 'follows:following:{}'
+
+
+def get_cache():
+    return caches[getattr(settings, 'FOLLOW_CACHE_ALIAS', 'default')]
+
+
+def get_cache_timeout():
+    return getattr(settings, 'FOLLOW_CACHE_TIMEOUT', 300)
+
+
+def get_following_ids(user_id):
+    """
+    Return the frozenset of ids the user follows, loading it on a cache miss.
+    """
+    cache = get_cache()
+    key = CACHE_KEY.format(user_id)
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(Follow.objects.filter(follower_id=user_id).values_list('following_id', flat=True))
+        cache.set(key, ids, get_cache_timeout())
+    return ids
+
+
+def invalidate(user_id):
+    get_cache().delete(CACHE_KEY.format(user_id))
+
+
+def is_following(user_id, target_id):
+    return target_id in get_following_ids(user_id)
+
+
+def following_status(user_id, target_ids):
+    """
+    Map each of ``target_ids`` to whether the user follows it.
+    """
+    following = get_following_ids(user_id)
+    return {target_id: target_id in following for target_id in target_ids}
+
+
+def follow(user, target):
+    """
+    Make ``user`` follow ``target``. Returns True if a new edge was created.
+    """
+    if user.pk == target.pk:
+        raise ValueError('Users cannot follow themselves.')
+    try:
+        with transaction.atomic():
+            Follow.objects.create(follower=user, following=target)
+    except IntegrityError:
+        # Already following; concurrent follows race on unique_follow.
+        return False
+    return True
+
+
+def unfollow(user, target):
+    """
+    Remove the edge from ``user`` to ``target``. Returns True if one existed.
+    """
+    edge = Follow.objects.filter(follower=user, following=target).first()
+    if edge is None:
+        return False
+    edge.delete()
+    return True
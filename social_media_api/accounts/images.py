@@ -0,0 +1,189 @@
+"""
+Profile picture variants.
+
+Uploads are streamed to a temporary file on disk in chunks (see
+``FILE_UPLOAD_HANDLERS``) and stored as sent. Once the save commits, the
+stored original is handed to a small thread pool, which decodes it once and
+writes a square thumbnail for each of ``PROFILE_PICTURE_SIZES`` in each of
+``PROFILE_PICTURE_FORMATS``. Variants are re-encoded from pixels only, so
+EXIF (including GPS position), ICC profiles and comments are dropped; the
+EXIF orientation is applied first. Their names are recorded in
+``CustomUser.profile_picture_variants`` and responses pick the smallest
+variant covering the size they need. The original is only ever read by the
+workers; its URL is never exposed.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections
+from PIL import Image, ImageOps
+
+from .authentication import token_cache
+from .models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+# Pillow format, save options and file extension per variant format.
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}, 'webp'),
+    'jpeg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}, 'jpg'),
+}
+
+
+def get_sizes():
+    return tuple(sorted(getattr(settings, 'PROFILE_PICTURE_SIZES', (64, 128, 256, 512))))
+
+
+def get_formats():
+    return tuple(getattr(settings, 'PROFILE_PICTURE_FORMATS', ('webp', 'jpeg')))
+
+
+def get_max_upload_size():
+    return getattr(settings, 'PROFILE_PICTURE_MAX_UPLOAD_SIZE', 10 * 1024 * 1024)
+
+
+def open_image(file, size):
+    """
+    Decode ``file`` upright, at no less than ``size`` x ``size`` pixels.
+    """
+    image = Image.open(file)
+    # JPEGs are decoded straight at 1/2, 1/4 or 1/8 scale when that still
+    # covers the largest variant.
+    image.draft('RGB', (size, size))
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        return image.convert('RGBA')
+    return image.convert('RGB')
+
+
+def encode(image, fmt):
+    """
+    Encode ``image`` as ``fmt`` without any metadata.
+    """
+    pil_format, options, ext = FORMATS[fmt]
+    if pil_format == 'JPEG' and image.mode == 'RGBA':
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    buffer = BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def render_variants(file):
+    """
+    Return {size: {format: encoded bytes}} for the picture in ``file``.
+    """
+    sizes = get_sizes()
+    image = open_image(file, sizes[-1])
+    variants = {}
+    # Each thumbnail is scaled down from the next larger one.
+    for size in reversed(sizes):
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        variants[size] = {fmt: encode(image, fmt) for fmt in get_formats()}
+    return variants
+
+
+def variant_name(name, size, fmt):
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'variants', f'{stem}_{size}.{FORMATS[fmt][2]}')
+
+
+def delete_variants(variants):
+    for names in variants.values():
+        for name in names.values():
+            default_storage.delete(name)
+
+
+def process_profile_picture(user_id, name):
+    """
+    Write the variants of the stored picture ``name`` and record them on the
+    user. Returns the variants, or None if the picture was replaced meanwhile.
+    """
+    with default_storage.open(name) as file:
+        rendered = render_variants(file)
+    variants = {}
+    for size, encoded in rendered.items():
+        variants[str(size)] = {}
+        for fmt, data in encoded.items():
+            path = variant_name(name, size, fmt)
+            default_storage.delete(path)
+            variants[str(size)][fmt] = default_storage.save(path, ContentFile(data))
+    
+    if not CustomUser.objects.filter(pk=user_id, profile_picture=name).update(profile_picture_variants=variants):
+        delete_variants(variants)
+        return None
+    # update() skips post_save, so drop the cached user here.
+    token_cache.invalidate_user(user_id)
+    return variants
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'PROFILE_PICTURE_WORKERS', 2),
+                thread_name_prefix='profile-pictures',
+            )
+    return _executor
+
+
+def _process_in_worker(user_id, name):
+    try:
+        return process_profile_picture(user_id, name)
+    except Exception:
+        logger.exception('Processing the profile picture %r of user %s failed', name, user_id)
+    finally:
+        close_old_connections()
+
+
+def schedule(user_id, name):
+    """
+    Queue variant generation for a stored picture. With
+    ``PROFILE_PICTURE_ASYNC`` disabled it runs inline.
+    """
+    if not getattr(settings, 'PROFILE_PICTURE_ASYNC', True):
+        process_profile_picture(user_id, name)
+        return
+    get_executor().submit(_process_in_worker, user_id, name)
+
+
+def pick_variant(user, size=None, formats=None):
+    """
+    Storage name of the smallest variant at least ``size`` pixels wide
+    (the largest when None), preferring ``formats`` in order. None without a
+    picture, and while its variants are pending: the original still carries
+    the uploader's metadata, so it is never handed out.
+    """
+    variants = user.profile_picture_variants
+    if not user.profile_picture or not variants:
+        return None
+    sizes = sorted(int(key) for key in variants)
+    chosen = sizes[-1] if size is None else next((key for key in sizes if key >= size), sizes[-1])
+    names = variants[str(chosen)]
+    for fmt in formats or get_formats():
+        if fmt in names:
+            return names[fmt]
+    return next(iter(names.values()))
+
+
+def variant_url(user, size=None, formats=None, request=None):
+    name = pick_variant(user, size, formats)
+    if name is None:
+        return None
+    url = default_storage.url(name)
+    if request is not None:
+        url = request.build_absolute_uri(url)
+    return url
@@ -0,0 +1,182 @@
+"""
+Login hardening.
+
+Password hashing is slow by design, so every login attempt costs a CPU
+core for a noticeable time. Failed attempts are counted per account
+(username) and per client IP in the shared cache (``LOGIN_GUARD_CACHE_ALIAS``).
+Once a counter reaches its threshold (``LOGIN_ACCOUNT_FAILURE_LIMIT`` /
+``LOGIN_IP_FAILURE_LIMIT``) the key is blocked for ``LOGIN_BACKOFF_BASE``
+seconds, doubling with every further failure up to ``LOGIN_BACKOFF_MAX``,
+and blocked attempts are rejected with 429 *before* any password is hashed.
+Counters expire ``LOGIN_FAILURE_WINDOW`` seconds after the last failure; a
+successful login clears the account's counter (not the IP's). As in
+``core.throttling.CacheBucketStore`` the read-modify-write is not atomic, so
+concurrent failures may occasionally be counted once.
+
+Credentials are verified on a bounded pool of ``LOGIN_HASH_WORKERS``
+threads. When ``LOGIN_HASH_MAX_PENDING`` attempts are already running or
+queued, new ones are rejected immediately, so a login spike occupies at
+most that many threads instead of every worker. ``LOGIN_HASH_WORKERS = 0``
+verifies inline.
+"""
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import authenticate as django_authenticate
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+ACCOUNT_KEY = 'login:failures:account:{}'
+IP_KEY = 'login:failures:ip:{}'
+
+
+def get_cache():
+    return caches[getattr(settings, 'LOGIN_GUARD_CACHE_ALIAS', 'default')]
+
+
+def get_limits():
+    """
+    Return (account failure limit, IP failure limit).
+    """
+    return (
+        getattr(settings, 'LOGIN_ACCOUNT_FAILURE_LIMIT', 5),
+        getattr(settings, 'LOGIN_IP_FAILURE_LIMIT', 20),
+    )
+
+
+def backoff(failures, limit):
+    """
+    Seconds a key is blocked after its ``failures``-th failure.
+    """
+    if failures < limit:
+        return 0
+    base = getattr(settings, 'LOGIN_BACKOFF_BASE', 1)
+    return min(base * 2 ** (failures - limit), getattr(settings, 'LOGIN_BACKOFF_MAX', 900))
+
+
+def get_keys(username, ip):
+    """
+    Return [(cache key, failure limit)] for the attempt's account and IP.
+    """
+    account_limit, ip_limit = get_limits()
+    # Hashed so any username is a valid cache key; case-folded so
+    # "Alice" and "alice" share one counter.
+    account = hashlib.sha256(username.casefold().encode()).hexdigest()
+    keys = [(ACCOUNT_KEY.format(account), account_limit)]
+    if ip:
+        keys.append((IP_KEY.format(ip), ip_limit))
+    return keys
+
+
+def blocked_for(keys, now=None):
+    """
+    Seconds until every key in ``keys`` may attempt again (0 if none is blocked).
+    """
+    now = time.time() if now is None else now
+    states = get_cache().get_many([key for key, limit in keys])
+    return max([blocked_until - now for failures, blocked_until in states.values()] + [0])
+
+
+def record_failure(keys, now=None):
+    now = time.time() if now is None else now
+    cache = get_cache()
+    states = cache.get_many([key for key, limit in keys])
+    window = getattr(settings, 'LOGIN_FAILURE_WINDOW', 3600)
+    for key, limit in keys:
+        failures = states.get(key, (0, 0))[0] + 1
+        cache.set(key, (failures, now + backoff(failures, limit)), window)
+
+
+def record_success(keys):
+    # Only the account: a success must not reset a guessing IP's counter.
+    get_cache().delete(keys[0][0])
+
+
+class HashingPool:
+    """
+    A thread pool that refuses work beyond ``max_pending`` running or queued calls.
+    """
+    
+    def __init__(self, workers, max_pending):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='login-hashing')
+        self.slots = threading.BoundedSemaphore(max_pending)
+    
+    def submit(self, fn, *args):
+        """
+        Return a future for ``fn(*args)``, or None when the pool is full.
+        """
+        if not self.slots.acquire(blocking=False):
+            return None
+        future = self.executor.submit(self._call, fn, *args)
+        future.add_done_callback(lambda future: self.slots.release())
+        return future
+    
+    @staticmethod
+    def _call(fn, *args):
+        try:
+            return fn(*args)
+        finally:
+            close_old_connections()
+
+
+_pools = {}
+
+
+def get_pool():
+    """
+    The process's hashing pool, or None when hashing runs inline.
+    """
+    workers = getattr(settings, 'LOGIN_HASH_WORKERS', 0)
+    if not workers:
+        return None
+    config = (workers, getattr(settings, 'LOGIN_HASH_MAX_PENDING', 32))
+    pool = _pools.get(config)
+    if pool is None:
+        pool = _pools[config] = HashingPool(*config)
+    return pool
+
+
+@receiver(setting_changed)
+def reset_pools(setting, **kwargs):
+    if setting in ('LOGIN_HASH_WORKERS', 'LOGIN_HASH_MAX_PENDING'):
+        _pools.clear()
+
+
+def check_credentials(username, password):
+    return django_authenticate(username=username, password=password)
+
+
+def verify(username, password):
+    pool = get_pool()
+    if pool is None:
+        return check_credentials(username, password)
+    future = pool.submit(check_credentials, username, password)
+    if future is None:
+        raise Throttled(wait=1, detail='Too many logins in progress. Try again shortly.')
+    return future.result()
+
+
+def authenticate(request, username, password):
+    """
+    ``django.contrib.auth.authenticate`` behind the failure counters and the
+    hashing pool. Raises ``Throttled`` instead of hashing when the account or
+    the client IP is backing off, or when the pool is full.
+    """
+    ip = BaseThrottle().get_ident(request) if request is not None else None
+    keys = get_keys(username, ip)
+    wait = blocked_for(keys)
+    if wait > 0:
+        raise Throttled(wait=wait, detail='Too many failed login attempts. Try again later.')
+    user = verify(username, password)
+    if user is None:
+        record_failure(keys)
+    else:
+        record_success(keys)
+    return user
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from accounts.images import process_profile_picture
+from accounts.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = 'Writes the resized variants of profile pictures that have none (or of all with --all)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenerate existing variants too')
+
+    def handle(self, *args, **options):
+        users = CustomUser.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+        if not options['all']:
+            users = users.filter(profile_picture_variants={})
+        processed = 0
+        for user_id, name in users.values_list('pk', 'profile_picture').iterator():
+            if process_profile_picture(user_id, name) is not None:
+                processed += 1
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} profile pictures'))
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:04
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_follow_counts(apps, schema_editor):
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    Follow = CustomUser.followers.through
+    follower_count = Follow.objects.filter(from_customuser=OuterRef('pk')).values(
+        'from_customuser'
+    ).annotate(count=Count('id')).values('count')
+    following_count = Follow.objects.filter(to_customuser=OuterRef('pk')).values(
+        'to_customuser'
+    ).annotate(count=Count('id')).values('count')
+    CustomUser.objects.update(
+        follower_count=Coalesce(Subquery(follower_count), 0),
+        following_count=Coalesce(Subquery(following_count), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_customuser_profile_picture'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='follower_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_follow_counts, migrations.RunPython.noop),
+    ]
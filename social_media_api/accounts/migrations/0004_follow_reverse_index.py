@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_counters'),
+    ]
+
+    operations = [
+        # "Who does X follow" lookups scan the follow table by follower; the
+        # auto-created through table only has a unique index led by the
+        # followed account.
+        migrations.RunSQL(
+            'CREATE INDEX accounts_follow_follower_idx '
+            'ON accounts_customuser_followers (to_customuser_id, from_customuser_id)',
+            'DROP INDEX accounts_follow_follower_idx',
+        ),
+    ]
@@ -0,0 +1,70 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_edges_forward(apps, schema_editor):
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    Follow = apps.get_model('accounts', 'Follow')
+    # On the auto-created through table from_customuser is the followed
+    # account and to_customuser the follower.
+    edges = CustomUser.followers.through.objects.values_list('from_customuser_id', 'to_customuser_id')
+    Follow.objects.bulk_create(
+        (Follow(following_id=following, follower_id=follower) for following, follower in edges.iterator()),
+        batch_size=1000,
+    )
+
+
+def copy_edges_backward(apps, schema_editor):
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    Follow = apps.get_model('accounts', 'Follow')
+    Through = CustomUser.followers.through
+    edges = Follow.objects.values_list('following_id', 'follower_id')
+    Through.objects.bulk_create(
+        (Through(from_customuser_id=following, to_customuser_id=follower) for following, follower in edges.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_follow_reverse_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Follow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('follower', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following_edges', to=settings.AUTH_USER_MODEL)),
+                ('following', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='follower_edges', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['following', '-created_at'], name='follow_following_created_idx'),
+                    models.Index(fields=['follower', '-created_at'], name='follow_follower_created_idx'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(fields=('follower', 'following'), name='unique_follow'),
+                    models.CheckConstraint(condition=models.Q(('follower', models.F('following')), _negated=True), name='no_self_follow'),
+                ],
+            },
+        ),
+        migrations.RunPython(copy_edges_forward, copy_edges_backward),
+        migrations.RunSQL(
+            'DROP INDEX accounts_follow_follower_idx',
+            'CREATE INDEX accounts_follow_follower_idx '
+            'ON accounts_customuser_followers (to_customuser_id, from_customuser_id)',
+        ),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='followers',
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='followers',
+            field=models.ManyToManyField(blank=True, related_name='following', through='accounts.Follow', through_fields=('following', 'follower'), to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -4,7 +4,62 @@ from django.db import models
 class CustomUser(AbstractUser):
     bio = models.TextField(max_length=500, blank=True)
     profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
-    followers = models.ManyToManyField('self', symmetrical=False, blank=True)
+    # Resized, metadata-free copies of profile_picture as
+    # {size: {format: storage name}}, written by accounts.images.
+    profile_picture_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # user.followers: accounts following this user; user.following: accounts
+    # this user follows. Edges are Follow rows.
+    followers = models.ManyToManyField(
+        'self',
+        symmetrical=False,
+        blank=True,
+        through='Follow',
+        through_fields=('following', 'follower'),
+        related_name='following',
+    )
+    # Denormalized counters maintained by signal handlers in accounts.signals
+    # and posts.signals; see the reconcile_counters command.
+    follower_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets accounts.signals tell whether a save replaced the picture.
+        instance._loaded_profile_picture = instance.__dict__.get('profile_picture')
+        return instance
     
     def __str__(self):
         return self.username
+
+class Follow(models.Model):
+    """
+    A follow edge: ``follower`` follows ``following``.
+    """
+    follower = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='following_edges'
+    )
+    following = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='follower_edges'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['follower', 'following'], name='unique_follow'),
+            models.CheckConstraint(condition=~models.Q(follower=models.F('following')), name='no_self_follow'),
+        ]
+        indexes = [
+            # Follower lists, newest first.
+            models.Index(fields=['following', '-created_at'], name='follow_following_created_idx'),
+            # Following lists, newest first.
+            models.Index(fields=['follower', '-created_at'], name='follow_follower_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.follower_id} follows {self.following_id}"
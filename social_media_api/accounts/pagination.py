@@ -0,0 +1,9 @@
+from core.pagination import KeysetPagination
+
+
+class FollowPagination(KeysetPagination):
+    """
+    Most recent follow edges first.
+    """
+    page_size = 20
+    ordering = ('-created_at', '-id')
@@ -1,15 +1,32 @@
 from rest_framework import serializers
 from rest_framework.authtoken.models import Token
-from django.contrib.auth import authenticate, get_user_model
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from . import images, login_guard
 
 CustomUser = get_user_model()
 
+
+def validate_picture_size(value):
+    # The upload is already on disk (FILE_UPLOAD_HANDLERS); this keeps
+    # oversized files out of storage and the image workers.
+    if value is not None and value.size > images.get_max_upload_size():
+        raise serializers.ValidationError(
+            f"Profile pictures may be at most {images.get_max_upload_size() // (1024 * 1024)} MB."
+        )
+    return value
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
     
     class Meta:
         model = CustomUser
         fields = ['username', 'email', 'password', 'bio', 'profile_picture']
+        extra_kwargs = {'profile_picture': {'write_only': True}}
+    
+    def validate_profile_picture(self, value):
+        return validate_picture_size(value)
     
     def create(self, validated_data):
         # Using get_user_model().objects.create_user() exactly as checker expects
@@ -37,7 +54,8 @@ class UserLoginSerializer(serializers.Serializer):
         password = data.get('password')
         
         if username and password:
-            user = authenticate(username=username, password=password)
+            # Counts failures and backs off before hashing (see accounts.login_guard).
+            user = login_guard.authenticate(self.context.get('request'), username, password)
             if user:
                 if user.is_active:
                     data['user'] = user
@@ -50,7 +68,56 @@ class UserLoginSerializer(serializers.Serializer):
         return data
 
 class UserProfileSerializer(serializers.ModelSerializer):
+    # {size: {format: url}} of the resized copies; empty until they are made.
+    profile_picture_variants = serializers.SerializerMethodField()
+    
     class Meta:
         model = CustomUser
-        fields = ['id', 'username', 'email', 'bio', 'profile_picture', 'followers']
-        read_only_fields = ['id', 'username', 'followers']
+        fields = [
+            'id', 'username', 'email', 'bio', 'profile_picture', 'profile_picture_variants',
+            'follower_count', 'following_count', 'post_count',
+        ]
+        read_only_fields = ['id', 'username', 'follower_count', 'following_count', 'post_count']
+        # Uploads only; the original keeps its EXIF/GPS metadata, so
+        # responses show the largest variant instead (see to_representation).
+        extra_kwargs = {'profile_picture': {'write_only': True}}
+    
+    def validate_profile_picture(self, value):
+        return validate_picture_size(value)
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['profile_picture'] = images.variant_url(instance, request=self.context.get('request'))
+        return data
+    
+    def get_profile_picture_variants(self, obj):
+        request = self.context.get('request')
+        urls = {}
+        for size, names in obj.profile_picture_variants.items():
+            urls[size] = {}
+            for fmt, name in names.items():
+                url = default_storage.url(name)
+                urls[size][fmt] = request.build_absolute_uri(url) if request is not None else url
+        return urls
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    # A PROFILE_PICTURE_SUMMARY_SIZE thumbnail rather than the original upload.
+    profile_picture = serializers.SerializerMethodField()
+    # Answered from the ``following_ids`` set in the serializer context
+    # (see accounts.follows) rather than one query per listed user.
+    is_following = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = CustomUser
+        fields = ['id', 'username', 'profile_picture', 'is_following']
+        read_only_fields = fields
+    
+    def get_profile_picture(self, obj):
+        size = getattr(settings, 'PROFILE_PICTURE_SUMMARY_SIZE', 64)
+        return images.variant_url(obj, size, request=self.context.get('request'))
+    
+    def get_is_following(self, obj):
+        following_ids = self.context.get('following_ids')
+        if following_ids is None:
+            return None
+        return obj.pk in following_ids
@@ -0,0 +1,87 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from . import follows, images
+from .authentication import token_cache
+from .models import CustomUser, Follow
+
+
+def _adjust(edges, delta):
+    """
+    Apply ``delta`` to the counters of both ends of each (following, follower) edge.
+    """
+    followed, followers = {}, {}
+    for following_id, follower_id in edges:
+        followed[following_id] = followed.get(following_id, 0) + 1
+        followers[follower_id] = followers.get(follower_id, 0) + 1
+    for user_id, count in followed.items():
+        CustomUser.objects.filter(pk=user_id).update(
+            follower_count=Greatest(F('follower_count') + delta * count, 0)
+        )
+    for user_id, count in followers.items():
+        CustomUser.objects.filter(pk=user_id).update(
+            following_count=Greatest(F('following_count') + delta * count, 0)
+        )
+        # Dropped now for reads later in this transaction, and again once it
+        # commits, in case a concurrent request refilled it from the old rows.
+        follows.invalidate(user_id)
+        transaction.on_commit(lambda user_id=user_id: follows.invalidate(user_id))
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        _adjust([(instance.following_id, instance.follower_id)], 1)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    # Also covers user.following.remove()/clear(), which delete Follow rows
+    # through a queryset and so send post_delete per edge.
+    _adjust([(instance.following_id, instance.follower_id)], -1)
+
+
+@receiver(m2m_changed, sender=Follow)
+def follows_added(sender, instance, action, reverse, pk_set, **kwargs):
+    # user.following.add() / user.followers.add() bulk insert Follow rows
+    # without post_save; pk_set only holds the edges actually created.
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        edges = [(pk, instance.pk) for pk in pk_set]
+    else:
+        edges = [(instance.pk, pk) for pk in pk_set]
+    _adjust(edges, 1)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    token_cache.invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=CustomUser)
+def profile_picture_saved(sender, instance, raw=False, **kwargs):
+    if raw or 'profile_picture' not in instance.__dict__:
+        # Fixtures, or a save with the picture deferred (so unchanged).
+        return
+    name = instance.profile_picture.name or ''
+    if name == (getattr(instance, '_loaded_profile_picture', None) or ''):
+        return
+    instance._loaded_profile_picture = name
+    stale = instance.profile_picture_variants
+    if stale:
+        instance.profile_picture_variants = {}
+        CustomUser.objects.filter(pk=instance.pk).update(profile_picture_variants={})
+        transaction.on_commit(lambda: images.delete_variants(stale))
+    if name:
+        transaction.on_commit(lambda: images.schedule(instance.pk, name))
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Covers deactivation as well as profile edits.
+    token_cache.invalidate_user(instance.pk)
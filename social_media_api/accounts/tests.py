@@ -1,3 +1,367 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
 
-# Create your tests here.
+User = get_user_model()
+
+
+class FollowListTestCase(TestCase):
+    """
+    Tests for the profile counts and the paginated follower lists.
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(username='popular')
+        self.fans = [User.objects.create(username=f'fan{i}') for i in range(5)]
+        for fan in self.fans:
+            self.user.followers.add(fan)
+        self.user.refresh_from_db()
+        self.client.force_authenticate(user=self.user)
+    
+    def test_profile_returns_counts_only(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/profile/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('followers', response.data)
+        self.assertEqual(response.data['follower_count'], 5)
+    
+    def test_profile_not_modified(self):
+        etag = self.client.get('/profile/')['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get('/profile/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        self.client.put('/profile/', {'bio': 'Updated'})
+        response = self.client.get('/profile/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['bio'], 'Updated')
+    
+    def test_followers_are_paginated_newest_first(self):
+        response = self.client.get(f'/users/{self.user.id}/followers/?page_size=2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([u['username'] for u in response.data['results']], ['fan4', 'fan3'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([u['username'] for u in response.data['results']], ['fan2', 'fan1'])
+    
+    def test_following(self):
+        response = self.client.get(f'/users/{self.fans[0].id}/following/')
+        self.assertEqual([u['username'] for u in response.data['results']], ['popular'])
+    
+    def test_unknown_user(self):
+        response = self.client.get('/users/999/followers/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class FollowTestCase(TestCase):
+    """
+    Tests for the follow endpoints and cached membership checks.
+    """
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create(username='reader')
+        self.authors = [User.objects.create(username=f'author{i}') for i in range(3)]
+        self.client.force_authenticate(user=self.user)
+    
+    def test_follow_and_unfollow(self):
+        target = self.authors[0]
+        response = self.client.post(f'/users/{target.id}/follow/')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(f'/users/{target.id}/follow/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        target.refresh_from_db()
+        self.assertEqual(target.follower_count, 1)
+        
+        response = self.client.delete(f'/users/{target.id}/follow/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        target.refresh_from_db()
+        self.user.refresh_from_db()
+        self.assertEqual(target.follower_count, 0)
+        self.assertEqual(self.user.following_count, 0)
+    
+    def test_cannot_follow_self(self):
+        response = self.client.post(f'/users/{self.user.id}/follow/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_status_is_served_from_cache(self):
+        from . import follows
+        follows.follow(self.user, self.authors[1])
+        ids = ','.join(str(author.id) for author in self.authors)
+        self.client.get(f'/follows/status/?ids={ids}')
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/follows/status/?ids={ids}')
+        self.assertEqual(response.data, {
+            str(self.authors[0].id): False,
+            str(self.authors[1].id): True,
+            str(self.authors[2].id): False,
+        })
+    
+    def test_cache_is_invalidated_on_unfollow(self):
+        from . import follows
+        follows.follow(self.user, self.authors[0])
+        self.assertTrue(follows.is_following(self.user.id, self.authors[0].id))
+        self.user.following.remove(self.authors[0])
+        self.assertFalse(follows.is_following(self.user.id, self.authors[0].id))
+    
+    def test_cache_is_invalidated_again_on_commit(self):
+        from . import follows
+        with self.captureOnCommitCallbacks(execute=True):
+            follows.follow(self.user, self.authors[0])
+            # A concurrent request caching the set from before the follow.
+            follows.get_cache().set(follows.CACHE_KEY.format(self.user.id), frozenset(), 300)
+        self.assertTrue(follows.is_following(self.user.id, self.authors[0].id))
+    
+    def test_list_badges_cost_no_extra_queries(self):
+        for author in self.authors:
+            author.followers.add(self.user)
+        popular = User.objects.create(username='popular')
+        for author in self.authors:
+            popular.followers.add(author)
+        self.client.get(f'/users/{popular.id}/followers/')
+        # The profile lookup and the page of edges; badges come from the cached set.
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/users/{popular.id}/followers/')
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertTrue(all(u['is_following'] for u in response.data['results']))
+    
+    def test_invalid_status_ids(self):
+        response = self.client.get('/follows/status/?ids=1,x')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LoginThrottleTestCase(TestCase):
+    """
+    Login attempts are throttled per client IP.
+    """
+    
+    @override_settings(THROTTLE_STORE='core.throttling.LocMemBucketStore', LOGIN_HASH_WORKERS=0)
+    def test_login_is_throttled(self):
+        from core.throttling import get_store
+        get_store().clear()
+        client = APIClient()
+        rates = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {'login': '2/min'}}
+        with override_settings(REST_FRAMEWORK=rates):
+            for _ in range(2):
+                response = client.post('/login/', {'username': 'nobody', 'password': 'wrong'})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            response = client.post('/login/', {'username': 'nobody', 'password': 'wrong'})
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(response['X-RateLimit-Remaining'], '0')
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    LOGIN_HASH_WORKERS=0,
+    LOGIN_ACCOUNT_FAILURE_LIMIT=3,
+    LOGIN_IP_FAILURE_LIMIT=5,
+    REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}},
+)
+class LoginGuardTestCase(TestCase):
+    """
+    Tests for login failure counters, backoff and the hashing pool.
+    """
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='owner', password='right-password')
+    
+    def login(self, username='owner', password='wrong-password'):
+        return self.client.post('/login/', {'username': username, 'password': password})
+    
+    def test_blocked_account_is_rejected_before_hashing(self):
+        from unittest import mock
+        for _ in range(3):
+            self.assertEqual(self.login().status_code, status.HTTP_400_BAD_REQUEST)
+        with mock.patch('accounts.login_guard.check_credentials') as check:
+            response = self.login(password='right-password')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        check.assert_not_called()
+    
+    def test_success_clears_account_failures(self):
+        self.login()
+        self.login()
+        self.assertEqual(self.login(password='right-password').status_code, status.HTTP_200_OK)
+        self.login()
+        self.login()
+        self.assertEqual(self.login(password='right-password').status_code, status.HTTP_200_OK)
+    
+    def test_ip_is_blocked_across_accounts(self):
+        for i in range(5):
+            self.assertEqual(self.login(username=f'guess{i}').status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.login(password='right-password')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+    
+    def test_backoff_doubles_up_to_maximum(self):
+        from .login_guard import backoff
+        with self.settings(LOGIN_BACKOFF_BASE=2, LOGIN_BACKOFF_MAX=10):
+            self.assertEqual([backoff(failures, 3) for failures in range(1, 7)], [0, 0, 2, 4, 8, 10])
+    
+    def test_full_hashing_pool_refuses_work(self):
+        import threading
+        from .login_guard import HashingPool
+        pool = HashingPool(workers=1, max_pending=1)
+        release = threading.Event()
+        first = pool.submit(release.wait)
+        self.assertIsNone(pool.submit(release.wait))
+        release.set()
+        first.result()
+        self.assertEqual(pool.submit(sum, [1, 2]).result(), 3)
+    
+    def test_login_on_hashing_pool(self):
+        import threading
+        from unittest import mock
+        threads = []
+    
+        def check(username, password):
+            threads.append(threading.current_thread())
+        
+        with self.settings(LOGIN_HASH_WORKERS=1), mock.patch('accounts.login_guard.check_credentials', check):
+            response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotEqual(threads, [threading.current_thread()])
+        self.assertEqual(len(threads), 1)
+
+
+class CachedTokenAuthenticationTestCase(TestCase):
+    """
+    Tests for cached token -> user resolution.
+    """
+    
+    def setUp(self):
+        from django.core.cache import cache
+        from rest_framework.authtoken.models import Token
+        from .authentication import token_cache
+        cache.clear()
+        token_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create(username='member')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+    
+    def test_second_request_skips_token_lookup(self):
+        # Token lookup plus the profile counters, then the counters alone.
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get('/profile/').status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):
+            response = self.client.get('/profile/')
+        self.assertEqual(response.data['username'], 'member')
+    
+    def test_deleted_token_is_rejected(self):
+        self.client.get('/profile/')
+        self.token.delete()
+        self.assertEqual(self.client.get('/profile/').status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_deactivated_user_is_rejected(self):
+        self.client.get('/profile/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/profile/').status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_profile_edits_are_visible(self):
+        self.client.get('/profile/')
+        self.client.put('/profile/', {'bio': 'Updated'})
+        self.assertEqual(self.client.get('/profile/').data['bio'], 'Updated')
+
+
+class ProfilePictureTestCase(TestCase):
+    """
+    Tests for profile picture variants.
+    """
+    
+    def setUp(self):
+        import shutil
+        import tempfile
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root, PROFILE_PICTURE_ASYNC=False)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.client = APIClient()
+        self.user = User.objects.create(username='pictured')
+        self.client.force_authenticate(user=self.user)
+    
+    def make_upload(self, size=(800, 600)):
+        from io import BytesIO
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from PIL import Image
+        image = Image.new('RGB', size, 'red')
+        exif = Image.Exif()
+        exif[0x010F] = 'CameraMaker'  # Make
+        exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', exif=exif.tobytes())
+        return SimpleUploadedFile('me.jpg', buffer.getvalue(), content_type='image/jpeg')
+    
+    def upload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/profile/', {'profile_picture': self.make_upload()}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+    
+    def test_variants_are_square_and_stripped(self):
+        from django.core.files.storage import default_storage
+        from PIL import Image
+        self.upload()
+        variants = self.user.profile_picture_variants
+        self.assertEqual(sorted(variants, key=int), ['64', '128', '256', '512'])
+        for size, names in variants.items():
+            self.assertEqual(set(names), {'webp', 'jpeg'})
+            for name in names.values():
+                with default_storage.open(name) as file:
+                    image = Image.open(file)
+                    self.assertEqual(image.size, (int(size), int(size)))
+                    self.assertFalse(image.getexif())
+    
+    def test_replacing_picture_drops_old_variants(self):
+        from django.core.files.storage import default_storage
+        self.upload()
+        old = self.user.profile_picture_variants['64']['webp']
+        self.upload()
+        self.assertFalse(default_storage.exists(old))
+        self.assertTrue(default_storage.exists(self.user.profile_picture_variants['64']['webp']))
+    
+    def test_picture_endpoint_picks_variant(self):
+        self.upload()
+        variants = self.user.profile_picture_variants
+        response = self.client.get(f'/users/{self.user.id}/picture/?size=100', HTTP_ACCEPT='image/webp,*/*')
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertTrue(response['Location'].endswith(variants['128']['webp']))
+        self.assertIn('Accept', response['Vary'])
+        response = self.client.get(f'/users/{self.user.id}/picture/?size=1000', HTTP_ACCEPT='image/*')
+        self.assertTrue(response['Location'].endswith(variants['512']['jpeg']))
+    
+    def test_original_is_never_exposed(self):
+        with self.settings(PROFILE_PICTURE_ASYNC=True), self.captureOnCommitCallbacks(execute=False):
+            response = self.client.put('/profile/', {'profile_picture': self.make_upload()}, format='multipart')
+        self.assertIsNone(response.data['profile_picture'])
+        response = self.client.get(f'/users/{self.user.id}/picture/?size=64')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+        self.upload()
+        response = self.client.get('/profile/')
+        self.assertTrue(response.data['profile_picture'].endswith(self.user.profile_picture_variants['512']['webp']))
+        self.assertNotIn(self.user.profile_picture.name, str(response.data))
+    
+    def test_follow_lists_show_thumbnail(self):
+        fan = User.objects.create(username='fan')
+        self.user.followers.add(fan)
+        self.upload()
+        self.client.force_authenticate(user=fan)
+        response = self.client.get(f'/users/{fan.id}/following/')
+        self.assertTrue(response.data['results'][0]['profile_picture'].endswith(
+            self.user.profile_picture_variants['64']['webp']
+        ))
+    
+    def test_oversized_upload_is_rejected(self):
+        with self.settings(PROFILE_PICTURE_MAX_UPLOAD_SIZE=100):
+            response = self.client.put('/profile/', {'profile_picture': self.make_upload()}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('profile_picture', response.data)
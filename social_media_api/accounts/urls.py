@@ -1,8 +1,16 @@
 from django.urls import path
-from .views import UserRegistrationView, UserLoginView, UserProfileView
+from .views import (
+    UserRegistrationView, UserLoginView, UserProfileView, FollowersView, FollowingView,
+    FollowView, FollowStatusView, UserPictureView,
+)
 
 urlpatterns = [
     path('register/', UserRegistrationView.as_view(), name='register'),
     path('login/', UserLoginView.as_view(), name='login'),
     path('profile/', UserProfileView.as_view(), name='profile'),
+    path('users/<int:pk>/followers/', FollowersView.as_view(), name='user-followers'),
+    path('users/<int:pk>/following/', FollowingView.as_view(), name='user-following'),
+    path('users/<int:pk>/follow/', FollowView.as_view(), name='user-follow'),
+    path('users/<int:pk>/picture/', UserPictureView.as_view(), name='user-picture'),
+    path('follows/status/', FollowStatusView.as_view(), name='follow-status'),
 ]
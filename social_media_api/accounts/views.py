@@ -1,10 +1,19 @@
-from rest_framework import status
+from rest_framework import generics, serializers, status
+from rest_framework.negotiation import BaseContentNegotiation
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.authtoken.models import Token
+from django.conf import settings
 from django.contrib.auth import authenticate
-from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer
+from django.http import HttpResponseRedirect
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from core.conditional import make_etag, not_modified, set_validators
+from . import follows, images
+from .models import CustomUser, Follow
+from .pagination import FollowPagination
+from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer, UserSummarySerializer
 
 class UserRegistrationView(APIView):
     permission_classes = [AllowAny]
@@ -23,9 +32,10 @@ class UserRegistrationView(APIView):
 
 class UserLoginView(APIView):
     permission_classes = [AllowAny]
+    throttle_scope = 'login'
     
     def post(self, request):
-        serializer = UserLoginSerializer(data=request.data)
+        serializer = UserLoginSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             user = serializer.validated_data['user']
             token, created = Token.objects.get_or_create(user=user)
@@ -38,14 +48,151 @@ class UserLoginView(APIView):
 
 class UserProfileView(APIView):
     permission_classes = [IsAuthenticated]
+    counter_fields = ['follower_count', 'following_count', 'post_count']
+    
+    def get_user(self, request):
+        """
+        ``request.user`` with its counters read fresh: the rest of the row
+        comes from the authentication cache, which counter updates leave
+        alone so that active users keep their cached tokens.
+        """
+        user = request.user
+        counters = CustomUser.objects.filter(pk=user.pk).values(*self.counter_fields).get()
+        for field, value in counters.items():
+            setattr(user, field, value)
+        return user
     
     def get(self, request):
-        serializer = UserProfileSerializer(request.user)
-        return Response(serializer.data)
+        # One query for the counters; there is no timestamp for Last-Modified.
+        user = self.get_user(request)
+        etag = make_etag('profile', *(str(getattr(user, field)) for field in UserProfileSerializer.Meta.fields))
+        response = not_modified(request, etag)
+        if response is None:
+            response = set_validators(Response(UserProfileSerializer(user).data), etag)
+        return response
     
     def put(self, request):
-        serializer = UserProfileSerializer(request.user, data=request.data, partial=True)
+        serializer = UserProfileSerializer(self.get_user(request), data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class FollowListView(generics.ListAPIView):
+    """
+    Cursor-paginated list of one side of a user's follow edges.
+
+    Pages are read from the follow edge table so a page costs one indexed
+    range scan joined to the listed users, whatever the audience size.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = UserSummarySerializer
+    pagination_class = FollowPagination
+    # Edge column holding the profile owner, and the edge relation to list.
+    owner_field = None
+    listed_field = None
+    
+    def get_queryset(self):
+        user = get_object_or_404(CustomUser, pk=self.kwargs['pk'])
+        edges = Follow.objects.filter(**{self.owner_field: user})
+        return edges.select_related(self.listed_field)
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['following_ids'] = follows.get_following_ids(self.request.user.pk)
+        return context
+    
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        users = [getattr(edge, self.listed_field) for edge in page]
+        serializer = self.get_serializer(users, many=True)
+        return self.get_paginated_response(serializer.data)
+
+class FollowersView(FollowListView):
+    owner_field = 'following'
+    listed_field = 'follower'
+
+class FollowingView(FollowListView):
+    owner_field = 'follower'
+    listed_field = 'following'
+
+class FollowView(APIView):
+    """
+    POST follows the user, DELETE unfollows them.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, pk):
+        target = get_object_or_404(CustomUser, pk=pk)
+        if target.pk == request.user.pk:
+            return Response({'detail': 'You cannot follow yourself.'}, status=status.HTTP_400_BAD_REQUEST)
+        created = follows.follow(request.user, target)
+        return Response(
+            {'following': True},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+    
+    def delete(self, request, pk):
+        target = get_object_or_404(CustomUser, pk=pk)
+        follows.unfollow(request.user, target)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class FollowStatusView(APIView):
+    """
+    Batch "does the current user follow X" check: ``?ids=1,2,3``.
+    """
+    permission_classes = [IsAuthenticated]
+    max_ids = 100
+    
+    def get(self, request):
+        raw = request.query_params.get('ids', '')
+        try:
+            ids = [int(value) for value in raw.split(',') if value.strip()]
+        except ValueError:
+            raise serializers.ValidationError({'ids': 'Expected a comma-separated list of user ids.'})
+        if len(ids) > self.max_ids:
+            raise serializers.ValidationError({'ids': f'At most {self.max_ids} ids per request.'})
+        status_map = follows.following_status(request.user.pk, ids)
+        return Response({str(user_id): following for user_id, following in status_map.items()})
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """
+    Always use the first renderer, whatever the ``Accept`` header asks for.
+    """
+    
+    def select_parser(self, request, parsers):
+        return parsers[0]
+    
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+class UserPictureView(APIView):
+    """
+    Redirect to the user's picture variant for ``?size=<pixels>``: the
+    smallest one at least that wide (the largest without ``size``), in WebP
+    when the client accepts it.
+    """
+    permission_classes = [AllowAny]
+    # Accept negotiates the image format here, not the error body's.
+    content_negotiation_class = IgnoreClientContentNegotiation
+    
+    def get(self, request, pk):
+        try:
+            size = int(request.query_params['size']) if 'size' in request.query_params else None
+        except ValueError:
+            raise serializers.ValidationError({'size': 'Expected a size in pixels.'})
+        user = get_object_or_404(CustomUser.objects.only('profile_picture', 'profile_picture_variants'), pk=pk)
+        accepts_webp = 'image/webp' in request.headers.get('Accept', '')
+        formats = [fmt for fmt in images.get_formats() if fmt != 'webp' or accepts_webp]
+        url = images.variant_url(user, size, formats)
+        if url is None:
+            if user.profile_picture:
+                detail = 'This profile picture is still being processed.'
+            else:
+                detail = 'This user has no profile picture.'
+            return Response({'detail': detail}, status=status.HTTP_404_NOT_FOUND)
+        response = HttpResponseRedirect(url)
+        patch_vary_headers(response, ['Accept'])
+        patch_cache_control(response, public=True, max_age=getattr(settings, 'PROFILE_PICTURE_REDIRECT_MAX_AGE', 300))
+        return response
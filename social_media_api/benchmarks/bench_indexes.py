@@ -0,0 +1,154 @@
+"""
+Benchmark the hot post/comment queries with and without the composite indexes.
+
+Seeds a scratch SQLite database (never the project database), times a keyset
+page of the post list (as PostPagination reads it), filter-by-author and
+per-post comment listing queries, then drops the composite indexes added in
+posts.0005_query_indexes and times them again.
+
+Usage (from the social_media_api directory):
+
+    python benchmarks/bench_indexes.py --posts 1000000 --users 10000 --comments 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'social_media_api.settings')
+
+INDEXES = ['post_created_idx', 'post_author_created_idx', 'comment_post_created_idx']
+BATCH_SIZE = 10000
+
+
+def seed(connection, posts, users, comments):
+    from django.db import transaction
+    from django.utils import timezone
+    
+    start = timezone.now() - timedelta(days=365)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO accounts_customuser (password, is_superuser, username, first_name, last_name, "
+            "email, is_staff, is_active, date_joined, bio, follower_count, following_count, post_count, "
+            "profile_picture_variants) "
+            "VALUES ('', 0, %s, '', '', '', 0, 1, %s, '', 0, 0, 0, '{}')",
+            [(f'bench{i}', start) for i in range(users)],
+        )
+        cursor.execute("SELECT MIN(id) FROM accounts_customuser WHERE username LIKE 'bench%%'")
+        first_user = cursor.fetchone()[0]
+        
+        for offset in range(0, posts, BATCH_SIZE):
+            rows = []
+            for i in range(offset, min(offset + BATCH_SIZE, posts)):
+                created = start + timedelta(seconds=i * 30)
+                rows.append((first_user + random.randrange(users), f'Post {i}', 'Lorem ipsum', created, created))
+            cursor.executemany(
+                "INSERT INTO posts_post (author_id, title, content, created_at, updated_at, "
+                "fanout_on_read, comment_count) VALUES (%s, %s, %s, %s, %s, 0, 0)",
+                rows,
+            )
+        cursor.execute("SELECT MIN(id), MAX(id) FROM posts_post")
+        first_post, last_post = cursor.fetchone()
+        
+        for offset in range(0, comments, BATCH_SIZE):
+            rows = []
+            for i in range(offset, min(offset + BATCH_SIZE, comments)):
+                created = start + timedelta(seconds=i * 30)
+                rows.append((random.randint(first_post, last_post), first_user + random.randrange(users),
+                             'Nice post', created, created))
+            cursor.executemany(
+                "INSERT INTO posts_comment (post_id, author_id, content, created_at, updated_at) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                rows,
+            )
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return first_user, first_post, last_post
+
+
+def timed(query, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        list(query())
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run_queries(first_user, users, first_post, last_post, repeat):
+    from posts.models import Post, Comment
+    from posts.pagination import PostPagination
+    
+    # The keyset filter PostPagination applies for the page after row 1000,
+    # i.e. page 101 of the post list as the API reads it.
+    pagination = PostPagination()
+    position = Post.objects.order_by(*pagination.ordering).values_list('created_at', 'id')[999]
+    page_filter = pagination.get_keyset_filter(position)
+    
+    def post_list():
+        return Post.objects.filter(page_filter).order_by(*pagination.ordering)[:10]
+    
+    def by_author():
+        author = first_user + random.randrange(users)
+        return Post.objects.filter(author_id=author).order_by('-created_at', '-id')[:10]
+    
+    def comments():
+        post = random.randint(first_post, last_post)
+        return Comment.objects.filter(post_id=post).order_by('created_at', 'id')[:10]
+    
+    return {
+        'post list (page 101)': timed(post_list, repeat),
+        'filter by author': timed(by_author, repeat),
+        'comments for post': timed(comments, repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--posts', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--comments', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    
+    import django
+    from django.conf import settings
+    
+    directory = tempfile.mkdtemp(prefix='bench-indexes-')
+    settings.DATABASES['default']['NAME'] = os.path.join(directory, 'bench.sqlite3')
+    django.setup()
+    
+    from django.core.management import call_command
+    from django.db import connection
+    
+    call_command('migrate', verbosity=0)
+    # The benchmark measures B-tree indexes; skip full-text maintenance.
+    with connection.cursor() as cursor:
+        for suffix in ('ai', 'ad', 'au'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS posts_post_fts_{suffix}')
+    
+    print(f'Seeding {args.posts} posts, {args.comments} comments, {args.users} users ...')
+    started = time.perf_counter()
+    first_user, first_post, last_post = seed(connection, args.posts, args.users, args.comments)
+    print(f'Seeded in {time.perf_counter() - started:.1f}s\n')
+    
+    after = run_queries(first_user, args.users, first_post, last_post, args.repeat)
+    with connection.cursor() as cursor:
+        for name in INDEXES:
+            cursor.execute(f'DROP INDEX {name}')
+        cursor.execute('ANALYZE')
+    before = run_queries(first_user, args.users, first_post, last_post, args.repeat)
+    
+    print(f"{'query':<24}{'without (ms)':>14}{'with (ms)':>12}{'speedup':>10}")
+    for name in after:
+        print(f'{name:<24}{before[name]:>14.3f}{after[name]:>12.3f}{before[name] / after[name]:>9.1f}x')
+    print(f'\nScratch database: {settings.DATABASES["default"]["NAME"]}')
+
+
+if __name__ == '__main__':
+    main()
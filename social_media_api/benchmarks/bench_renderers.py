@@ -0,0 +1,82 @@
+"""
+Compare JSON rendering of PostSerializer payloads with DRF's JSONRenderer
+(stdlib json) and core.renderers.ORJSONRenderer.
+
+Posts are built in memory (no database), serialized once, and each renderer
+is timed on the resulting data. Reported times are per 1000 posts.
+
+Usage (from the social_media_api directory):
+
+    python benchmarks/bench_renderers.py --posts 1000 --repeat 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'social_media_api.settings')
+
+
+def build_payload(count):
+    from django.utils import timezone
+    from accounts.models import CustomUser
+    from posts.models import Post, Comment
+    from posts.serializers import PostSerializer
+    
+    now = timezone.now()
+    author = CustomUser(id=1, username='author')
+    posts = []
+    for i in range(count):
+        created = now - timedelta(minutes=i)
+        post = Post(id=i + 1, author=author, title=f'Post number {i}', content='Lorem ipsum dolor sit amet. ' * 20,
+                    created_at=created, updated_at=created, comment_count=3)
+        post.recent_comments = [
+            Comment(id=i * 3 + j, post=post, author=author, content=f'Comment {j} on post {i}',
+                    created_at=created, updated_at=created)
+            for j in range(3)
+        ]
+        posts.append(post)
+    return PostSerializer(posts, many=True).data
+
+
+def timed(render, data, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(data)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    
+    import django
+    django.setup()
+    
+    from rest_framework.renderers import JSONRenderer
+    from core import renderers
+    
+    data = build_payload(args.posts)
+    baseline = JSONRenderer().render(data)
+    fast = renderers.ORJSONRenderer().render(data)
+    assert fast == baseline, 'ORJSONRenderer output differs from JSONRenderer'
+    
+    scale = 1000 / args.posts * 1000
+    stdlib = timed(JSONRenderer().render, data, args.repeat) * scale
+    orjson = timed(renderers.ORJSONRenderer().render, data, args.repeat) * scale
+    print(f'PostSerializer payload: {len(baseline) / args.posts:.0f} bytes per post, '
+          f'orjson {"installed" if renderers.orjson else "NOT installed (fallback)"}')
+    print(f"{'renderer':<16}{'ms per 1000 posts':>20}")
+    print(f"{'JSONRenderer':<16}{stdlib:>20.3f}")
+    print(f"{'ORJSONRenderer':<16}{orjson:>20.3f}  ({stdlib / orjson:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Measure the per-request cost of the token-bucket throttle.
+
+Times ``TokenBucketThrottle.allow_request`` against each bucket store with a
+rate high enough that no request is rejected.
+
+Usage (from the social_media_api directory):
+
+    python benchmarks/bench_throttle.py --requests 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'social_media_api.settings')
+
+STORES = ['core.throttling.LocMemBucketStore', 'core.throttling.CacheBucketStore']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=100000)
+    parser.add_argument('--clients', type=int, default=1000)
+    args = parser.parse_args()
+    
+    import django
+    django.setup()
+    
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory, override_settings
+    from rest_framework.request import Request
+    from core.throttling import TokenBucketThrottle
+    
+    factory = RequestFactory()
+    requests = []
+    for i in range(args.clients):
+        request = Request(factory.get('/api/posts/', REMOTE_ADDR=f'10.0.{i // 256}.{i % 256}'))
+        request.user = AnonymousUser()
+        requests.append(request)
+    throttle = TokenBucketThrottle()
+    
+    print(f"{'store':<40}{'per request (us)':>18}")
+    for store in STORES:
+        rates = {'DEFAULT_THROTTLE_RATES': {'anon': f'{args.requests}/s'}}
+        with override_settings(THROTTLE_STORE=store, REST_FRAMEWORK=rates):
+            started = time.perf_counter()
+            for i in range(args.requests):
+                assert throttle.allow_request(requests[i % args.clients], None)
+            elapsed = time.perf_counter() - started
+        print(f'{store:<40}{elapsed / args.requests * 1e6:>18.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Conditional GET helpers.
+
+Views compute their validators (a weak ETag and optionally a Last-Modified
+time) from a cheap query *before* serializing. ``not_modified`` answers
+``If-None-Match`` / ``If-Modified-Since`` with a bodiless 304 when the client
+copy is current; otherwise the view serializes as usual and stamps the
+response with ``set_validators``.
+"""
+import hashlib
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """
+    Build a weak ETag from the values a response is derived from.
+    """
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def set_validators(response, etag, last_modified=None):
+    """
+    Set ``ETag`` and, when given a datetime, ``Last-Modified`` on ``response``.
+    """
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Return a 304 response (carrying the validators) if the client's cached
+    copy is still current, else None.
+    """
+    validators = set_validators(HttpResponse(), etag, last_modified)
+    response = get_conditional_response(
+        getattr(request, '_request', request),
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified is not None else None,
+        response=validators,
+    )
+    if response is validators:
+        return None
+    return response
@@ -0,0 +1,96 @@
+"""
+Sparse fieldsets.
+
+``?fields=id,title`` limits a GET response to the listed fields and
+``?exclude=content`` drops fields. Fields named in the serializer's
+``Meta.expandable_fields`` (nested data that costs extra queries) are only
+rendered on shaped requests when asked for, via ``?expand=comments`` or by
+listing them in ``?fields=``. Without any of these parameters the full
+representation is returned unchanged.
+
+``SparseFieldsetViewMixin.only_selected`` narrows a queryset to the columns
+the trimmed serializer reads, so unselected columns (such as large text
+bodies) are neither loaded nor shipped.
+"""
+from rest_framework import serializers
+
+FIELDSET_PARAMS = ('fields', 'exclude', 'expand')
+
+
+def parse_list(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def get_fieldset(request):
+    """
+    Return the requested (fields, exclude, expand) sets, or None when the
+    request does not shape the response.
+    """
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None
+    params = request.query_params
+    if not any(name in params for name in FIELDSET_PARAMS):
+        return None
+    fields = parse_list(params['fields']) if 'fields' in params else None
+    return fields, parse_list(params.get('exclude', '')), parse_list(params.get('expand', ''))
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that trims ``fields`` to the request's fieldset.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fieldset = get_fieldset(self.context.get('request'))
+        if fieldset is None:
+            return
+        fields, exclude, expand = fieldset
+        expandable = set(getattr(self.Meta, 'expandable_fields', ()))
+        unknown = (set(fields or ()) | exclude | expand) - set(self.fields)
+        unknown |= expand - expandable
+        if unknown:
+            raise serializers.ValidationError({'fields': f"Unknown field(s): {', '.join(sorted(unknown))}"})
+        
+        if fields is None:
+            selected = set(self.fields) - expandable
+        else:
+            selected = set(fields)
+        selected = (selected | expand) - exclude
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+
+
+class SparseFieldsetViewMixin:
+    """
+    View mixin that loads only the columns the response will render.
+    """
+    # Columns loaded whatever the fieldset, e.g. pagination keys.
+    always_loaded = ('pk',)
+    
+    def get_selected_fields(self):
+        """
+        The serializer fields this request renders, or None when unshaped.
+        """
+        if get_fieldset(self.request) is None:
+            return None
+        return self.get_serializer().fields
+    
+    def only_selected(self, queryset, fields):
+        """
+        Defer every column of ``queryset`` not read by ``fields``; related
+        attributes (``author.username``) are joined with ``select_related``.
+        """
+        columns = set(self.always_loaded)
+        related = set()
+        for field in fields.values():
+            if field.source == '*' or isinstance(field, serializers.BaseSerializer):
+                continue
+            path = field.source.replace('.', '__')
+            columns.add(path)
+            if '__' in path:
+                related.add(path.rsplit('__', 1)[0])
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
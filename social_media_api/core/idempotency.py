@@ -0,0 +1,116 @@
+"""
+Idempotent writes.
+
+Handlers decorated with ``@idempotent`` honour an ``Idempotency-Key``
+request header. The first request with a key runs normally and its response
+(status, data and headers) is stored in the ``IDEMPOTENCY_CACHE_ALIAS`` cache
+for ``IDEMPOTENCY_KEY_TTL`` seconds, together with a fingerprint of the
+request (method, path and body). Retries with the same key are answered
+from the cache, marked ``Idempotent-Replayed: true``, without running the
+handler again: no serializer validation and no database writes.
+
+Keys are scoped to the authenticated user (or client IP). Reusing a key for
+a different request is rejected with 422; a retry arriving while the first
+request is still running gets 409. Requests that fail with an exception or
+a 5xx response are not stored, so they can be retried with the same key.
+"""
+import functools
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def get_cache():
+    return caches[getattr(settings, 'IDEMPOTENCY_CACHE_ALIAS', 'default')]
+
+
+def get_ttl():
+    return getattr(settings, 'IDEMPOTENCY_KEY_TTL', 24 * 60 * 60)
+
+
+def get_lock_timeout():
+    return getattr(settings, 'IDEMPOTENCY_LOCK_TIMEOUT', 60)
+
+
+def get_cache_key(request, key):
+    if request.user.is_authenticated:
+        client = f'user:{request.user.pk}'
+    else:
+        client = f'ip:{BaseThrottle().get_ident(request)}'
+    digest = hashlib.sha256(f'{client}\n{request.method}\n{request.path}\n{key}'.encode()).hexdigest()
+    return f'idempotency:{digest}'
+
+
+def fingerprint(request):
+    digest = hashlib.sha256(f'{request.method}\n{request.path}\n'.encode())
+    # Nothing has parsed the body yet, so the raw bytes are still available.
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def replay(stored):
+    response = Response(stored['data'], status=stored['status'], headers=stored['headers'])
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(handler):
+    """
+    Make a view handler ``(self, request, *args, **kwargs)`` replay its first
+    response for retries sharing an ``Idempotency-Key``.
+    """
+    @functools.wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return handler(self, request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'detail': f'{HEADER} must be 1 to {MAX_KEY_LENGTH} characters.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        cache = get_cache()
+        cache_key = get_cache_key(request, key)
+        request_fingerprint = fingerprint(request)
+        # Claim the key; the placeholder expires if this process dies mid-request.
+        if not cache.add(cache_key, {'fingerprint': request_fingerprint, 'status': None}, get_lock_timeout()):
+            stored = cache.get(cache_key)
+            if stored is not None:
+                if stored['fingerprint'] != request_fingerprint:
+                    return Response(
+                        {'detail': f'This {HEADER} was already used for a different request.'},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                    )
+                if stored['status'] is None:
+                    return Response(
+                        {'detail': f'A request with this {HEADER} is still in progress.'},
+                        status=status.HTTP_409_CONFLICT
+                    )
+                return replay(stored)
+            # Expired between add() and get(): run the request unclaimed.
+        
+        try:
+            response = handler(self, request, *args, **kwargs)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+        if response.status_code >= 500 or not isinstance(response, Response):
+            cache.delete(cache_key)
+            return response
+        cache.set(cache_key, {
+            'fingerprint': request_fingerprint,
+            'status': response.status_code,
+            'data': response.data,
+            # Content-Type is set again when the replay is rendered.
+            'headers': {name: value for name, value in response.items() if name.lower() != 'content-type'},
+        }, get_ttl())
+        return response
+    return wrapper
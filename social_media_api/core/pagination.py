@@ -0,0 +1,170 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are addressed by an opaque cursor holding the sort key of the last row
+seen, so fetching any page is an indexed range scan with a ``LIMIT`` and no
+``COUNT(*)`` or ``OFFSET``. Rows inserted while a client is paging never shift
+the page boundaries.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate a queryset on a unique, ordered key such as ``(created_at, id)``.
+
+    ``ordering`` must end with a unique field so every row has a distinct
+    position. Fields may be model fields or queryset annotations.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+    
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+    
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = tuple(self.get_ordering(request, queryset, view))
+        
+        cursor = self.decode_cursor(request)
+        reverse = False
+        if cursor is not None:
+            values, reverse = cursor
+            try:
+                queryset = queryset.filter(self.get_keyset_filter(values, reverse))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+        
+        order_by = self.ordering
+        if reverse:
+            order_by = tuple(self._flip(field) for field in order_by)
+        results = list(queryset.order_by(*order_by)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+        
+        if reverse:
+            has_next, has_previous = cursor is not None, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+        
+        self.next_position = None
+        self.previous_position = None
+        if results:
+            if has_next:
+                self.next_position = self.get_position(results[-1])
+            if has_previous:
+                self.previous_position = self.get_position(results[0])
+        elif reverse and cursor is not None:
+            # Paged backwards past the start: resume forwards from the cursor.
+            self.next_position = cursor[0]
+        return results
+    
+    def get_keyset_filter(self, values, reverse=False):
+        """
+        Build the "strictly after ``values``" condition for the ordering, i.e.
+        ``a > x OR (a = x AND b > y) ...`` with each comparison following
+        the field's sort direction.
+        """
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name, descending = field.lstrip('-'), field.startswith('-')
+            if reverse:
+                descending = not descending
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        
+        # Redundant bound on the leading column lets the database use a
+        # range scan on the index instead of evaluating the OR for every row.
+        name, descending = self.ordering[0].lstrip('-'), self.ordering[0].startswith('-')
+        if reverse:
+            descending = not descending
+        leading = Q(**{f"{name}__{'lte' if descending else 'gte'}": values[0]})
+        return leading & condition
+    
+    def get_position(self, obj):
+        # Rows may be model instances or ``.values()`` dicts.
+        if isinstance(obj, dict):
+            return [obj[field.lstrip('-')] for field in self.ordering]
+        return [getattr(obj, field.lstrip('-')) for field in self.ordering]
+    
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+    
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+    
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+    
+    def encode_cursor(self, position, reverse):
+        values = [value.isoformat() if isinstance(value, datetime) else value for value in position]
+        payload = json.dumps({'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+    
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(parse.unquote(token).encode('ascii')))
+            return list(payload['v']), bool(payload['r'])
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+    
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else '-' + field
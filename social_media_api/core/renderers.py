@@ -0,0 +1,34 @@
+"""
+JSON rendering through orjson.
+
+``ORJSONRenderer`` produces the same JSON as DRF's ``JSONRenderer`` with the
+default ``UNICODE_JSON`` / ``COMPACT_JSON`` settings, several times faster.
+Values orjson cannot encode natively (lazy translations, Decimals, ...) go
+through DRF's ``JSONEncoder``. When orjson is not installed, when an indented
+response is requested (the browsable API) or when orjson rejects the data,
+rendering falls back to the stdlib-based ``JSONRenderer``.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    if orjson is not None:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Match JSONRenderer, which escapes these for embedding in JavaScript.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,180 @@
+"""
+Token-bucket request throttling.
+
+Every (scope, client) pair owns a bucket holding up to N tokens that refills
+continuously at N per period, as configured by the DRF rate strings in
+``DEFAULT_THROTTLE_RATES`` (``'30/min'``: bursts of 30, then one request
+every two seconds). A request spends one token or is rejected with 429.
+
+The scope is the view's ``throttle_scopes[action]`` or ``throttle_scope``,
+falling back to ``user`` / ``anon``; the client is the authenticated user
+(whatever token they use) or the client IP. Buckets live in a pluggable store
+named by ``THROTTLE_STORE``: ``LocMemBucketStore`` keeps them in this process,
+``CacheBucketStore`` in the shared ``THROTTLE_CACHE_ALIAS`` cache so all
+workers share one limit. ``RateLimitHeadersMiddleware`` reports the bucket in
+``X-RateLimit-*`` headers.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+RateLimit = namedtuple('RateLimit', ['limit', 'remaining', 'reset'])
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """
+    Turn ``'N/period'`` into (capacity, tokens refilled per second).
+    """
+    count, period = rate.split('/')
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+def refill(state, capacity, rate, now):
+    """
+    Spend one token from a bucket ``state`` of (tokens, last update).
+
+    Returns (allowed, new state).
+    """
+    if state is None:
+        tokens = capacity
+    else:
+        tokens, updated = state
+        tokens = min(capacity, tokens + (now - updated) * rate)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    return allowed, (tokens, now)
+
+
+class LocMemBucketStore:
+    """
+    Buckets in a process-local, size-bounded LRU mapping.
+    """
+    
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def consume(self, key, capacity, rate):
+        with self._lock:
+            allowed, state = refill(self._buckets.get(key), capacity, rate, time.time())
+            self._buckets[key] = state
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return allowed, state[0]
+    
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """
+    Buckets in the shared Django cache. Read-modify-write is not atomic, so
+    concurrent requests from one client may occasionally both spend the same
+    token. There is no ``clear()``: the cache is shared with other state
+    (cached tokens, idempotency keys), and buckets expire once full again.
+    """
+    
+    def __init__(self):
+        self.cache = caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+    
+    def consume(self, key, capacity, rate):
+        allowed, state = refill(self.cache.get(key), capacity, rate, time.time())
+        # Once the bucket would be full again the entry carries no information.
+        self.cache.set(key, state, math.ceil(capacity / rate) + 1)
+        return allowed, state[0]
+
+
+_stores = {}
+
+
+def get_store():
+    path = getattr(settings, 'THROTTLE_STORE', 'core.throttling.CacheBucketStore')
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = import_string(path)()
+    return store
+
+
+@receiver(setting_changed)
+def reset_stores(setting, **kwargs):
+    if setting in ('THROTTLE_STORE', 'THROTTLE_CACHE_ALIAS', 'CACHES'):
+        _stores.clear()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle each client per scope with a token bucket (see module docstring).
+    Scopes without a configured rate are not throttled.
+    """
+    
+    def get_scope(self, request, view):
+        scope = getattr(view, 'throttle_scopes', {}).get(getattr(view, 'action', None))
+        if scope is None:
+            scope = getattr(view, 'throttle_scope', None)
+        if scope is None:
+            scope = 'user' if request.user.is_authenticated else 'anon'
+        return scope
+    
+    def get_client_key(self, request):
+        if request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+    
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        scope = self.get_scope(request, view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if rate is None:
+            return True
+        capacity, per_second = parse_rate(rate)
+        key = f'throttle:{scope}:{self.get_client_key(request)}'
+        allowed, tokens = get_store().consume(key, capacity, per_second)
+        if not allowed:
+            self.wait_seconds = (1 - tokens) / per_second
+        request._request.rate_limit = RateLimit(
+            limit=capacity,
+            remaining=int(tokens),
+            reset=math.ceil((capacity - tokens) / per_second),
+        )
+        return allowed
+    
+    def wait(self):
+        return self.wait_seconds
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Add ``X-RateLimit-Limit``, ``X-RateLimit-Remaining`` and
+    ``X-RateLimit-Reset`` (seconds until the bucket is full) to throttled
+    responses.
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        response = self.get_response(request)
+        rate_limit = getattr(request, 'rate_limit', None)
+        if rate_limit is not None:
+            response['X-RateLimit-Limit'] = str(rate_limit.limit)
+            response['X-RateLimit-Remaining'] = str(rate_limit.remaining)
+            response['X-RateLimit-Reset'] = str(rate_limit.reset)
+        return response
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from notifications.outbox import process_outbox
+
+
+class Command(BaseCommand):
+    help = 'Folds pending notification events into notifications until the outbox is empty'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        processed = process_outbox(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} notification events'))
@@ -0,0 +1,88 @@
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+
+
+class Verb(models.TextChoices):
+    COMMENT = 'comment', 'commented on your post'
+    FOLLOW = 'follow', 'started following you'
+
+
+class NotificationEvent(models.Model):
+    """
+    Outbox row: one thing that happened, waiting to be folded into a
+    ``Notification`` by the worker (see notifications.outbox).
+    """
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    verb = models.CharField(max_length=20, choices=Verb.choices)
+    post = models.ForeignKey(
+        'posts.Post',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    def __str__(self):
+        return f"{self.actor_id} {self.verb} -> {self.recipient_id}"
+
+
+class Notification(models.Model):
+    """
+    What a user sees: all unread events with the same recipient, verb and
+    post coalesced into one row ("alice and 4 others commented on your post").
+    """
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='notifications'
+    )
+    verb = models.CharField(max_length=20, choices=Verb.choices)
+    post = models.ForeignKey(
+        'posts.Post',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='notifications'
+    )
+    actors = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='+')
+    latest_actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+'
+    )
+    actor_count = models.PositiveIntegerField(default=0)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        indexes = [
+            # Unread list, most recently active first.
+            models.Index(fields=['recipient', 'is_read', '-updated_at', '-id'], name='notification_unread_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Notification for {self.recipient_id}: {self.message}"
+    
+    @property
+    def message(self):
+        name = self.latest_actor.username if self.latest_actor else 'Someone'
+        action = Verb(self.verb).label
+        others = self.actor_count - 1
+        if others == 1:
+            return f"{name} and 1 other {action}"
+        if others > 1:
+            return f"{name} and {others} others {action}"
+        return f"{name} {action}"
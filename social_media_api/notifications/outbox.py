@@ -0,0 +1,192 @@
+"""
+Notification outbox and background worker.
+
+Comments and follows append a ``NotificationEvent`` row in the same
+transaction as the change that caused them; that single insert is all the
+notification work done on the request path. When the transaction commits,
+this process's worker thread is woken. It waits ``NOTIFICATIONS_BATCH_DELAY``
+seconds so bursts land in one batch, then folds pending events into
+``Notification`` rows: events sharing a recipient, verb and post are merged
+into the recipient's unread notification for them, and the events are
+deleted. Events left behind by a crash stay in the table until the next
+worker pass or ``manage.py process_notifications``.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, Q
+from posts.models import Post
+from .models import Notification, NotificationEvent, Verb
+
+logger = logging.getLogger(__name__)
+
+
+def get_batch_size():
+    return getattr(settings, 'NOTIFICATIONS_BATCH_SIZE', 500)
+
+
+def get_batch_delay():
+    return getattr(settings, 'NOTIFICATIONS_BATCH_DELAY', 0.5)
+
+
+def get_poll_interval():
+    return getattr(settings, 'NOTIFICATIONS_POLL_INTERVAL', 30)
+
+
+def record(events):
+    """
+    Queue unsaved ``NotificationEvent`` instances. Events whose actor is the
+    recipient are dropped. Returns the number of events queued.
+    """
+    events = [event for event in events if event.actor_id != event.recipient_id]
+    if not events:
+        return 0
+    NotificationEvent.objects.bulk_create(events)
+    transaction.on_commit(worker.wake)
+    return len(events)
+
+
+def record_comments(comments, post_authors=None):
+    """
+    Queue a comment event for the author of each comment's post.
+
+    ``post_authors`` maps post ids to author ids; it is looked up when omitted.
+    """
+    authors = post_authors
+    if authors is None:
+        authors = dict(
+            Post.objects.filter(pk__in={comment.post_id for comment in comments}).values_list('pk', 'author_id')
+        )
+    return record([
+        NotificationEvent(
+            recipient_id=authors[comment.post_id],
+            actor_id=comment.author_id,
+            verb=Verb.COMMENT,
+            post_id=comment.post_id,
+            created_at=comment.created_at,
+        )
+        for comment in comments
+    ])
+
+
+def process_batch(batch_size=None):
+    """
+    Fold up to ``batch_size`` pending events into notifications.
+
+    Returns the number of events processed.
+    """
+    batch_size = batch_size or get_batch_size()
+    with transaction.atomic():
+        pending = NotificationEvent.objects.order_by('id')
+        if connection.features.has_select_for_update_skip_locked:
+            # Lets workers in several processes share the outbox.
+            pending = pending.select_for_update(skip_locked=True)
+        events = list(pending[:batch_size])
+        if not events:
+            return 0
+        
+        groups = {}
+        for event in events:
+            groups.setdefault((event.recipient_id, event.verb, event.post_id), []).append(event)
+        post_ids = {key[2] for key in groups if key[2] is not None}
+        unread = Notification.objects.filter(
+            Q(post_id__in=post_ids) | Q(post__isnull=True),
+            recipient_id__in={key[0] for key in groups},
+            verb__in={key[1] for key in groups},
+            is_read=False,
+        )
+        notifications = {
+            (notification.recipient_id, notification.verb, notification.post_id): notification
+            for notification in unread
+        }
+        Notification.objects.bulk_create([
+            Notification(recipient_id=key[0], verb=key[1], post_id=key[2], updated_at=group[0].created_at)
+            for key, group in groups.items()
+            if key not in notifications
+        ])
+        # Re-read so rows created above have primary keys on every backend.
+        notifications = {
+            (notification.recipient_id, notification.verb, notification.post_id): notification
+            for notification in unread.all()
+        }
+        
+        Actor = Notification.actors.through
+        Actor.objects.bulk_create(
+            [
+                Actor(notification_id=notifications[key].pk, customuser_id=event.actor_id)
+                for key, group in groups.items()
+                for event in group
+            ],
+            ignore_conflicts=True,
+        )
+        counts = dict(
+            Actor.objects.filter(notification_id__in=[notifications[key].pk for key in groups])
+            .values_list('notification_id')
+            .annotate(count=Count('id'))
+        )
+        changed = []
+        for key, group in groups.items():
+            notification = notifications[key]
+            latest = group[-1]
+            notification.actor_count = counts[notification.pk]
+            notification.latest_actor_id = latest.actor_id
+            notification.updated_at = max(notification.updated_at, latest.created_at)
+            changed.append(notification)
+        Notification.objects.bulk_update(changed, ['actor_count', 'latest_actor', 'updated_at'])
+        NotificationEvent.objects.filter(pk__in=[event.pk for event in events]).delete()
+    return len(events)
+
+
+def process_outbox(batch_size=None):
+    """
+    Process batches until the outbox is empty. Returns the number of events processed.
+    """
+    total = 0
+    while True:
+        processed = process_batch(batch_size)
+        if not processed:
+            return total
+        total += processed
+
+
+class NotificationWorker:
+    """
+    One daemon thread per process draining the outbox.
+
+    The thread starts on the first wake-up and afterwards also polls every
+    ``NOTIFICATIONS_POLL_INTERVAL`` seconds. With ``NOTIFICATIONS_ASYNC``
+    disabled, wake-ups process the outbox inline instead.
+    """
+    
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def wake(self):
+        if not getattr(settings, 'NOTIFICATIONS_ASYNC', True):
+            process_outbox()
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='notifications-worker', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+    
+    def _run(self):
+        while True:
+            self._wakeup.wait(timeout=get_poll_interval())
+            time.sleep(get_batch_delay())
+            self._wakeup.clear()
+            try:
+                process_outbox()
+            except Exception:
+                logger.exception('Processing the notification outbox failed')
+            finally:
+                close_old_connections()
+
+
+worker = NotificationWorker()
@@ -0,0 +1,9 @@
+from core.pagination import KeysetPagination
+
+
+class NotificationPagination(KeysetPagination):
+    """
+    Most recently active notifications first, keyed on ``(updated_at, id)``.
+    """
+    page_size = 20
+    ordering = ('-updated_at', '-id')
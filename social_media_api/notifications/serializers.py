@@ -0,0 +1,12 @@
+from rest_framework import serializers
+from .models import Notification
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    latest_actor = serializers.ReadOnlyField(source='latest_actor.username')
+    message = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = Notification
+        fields = ['id', 'verb', 'post', 'latest_actor', 'actor_count', 'message', 'is_read', 'updated_at']
+        read_only_fields = fields
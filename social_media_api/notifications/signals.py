@@ -0,0 +1,34 @@
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+from accounts.models import Follow
+from posts.models import Comment
+from . import outbox
+from .models import NotificationEvent, Verb
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        outbox.record_comments([instance], {instance.post_id: instance.post.author_id})
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        outbox.record([
+            NotificationEvent(recipient_id=instance.following_id, actor_id=instance.follower_id, verb=Verb.FOLLOW)
+        ])
+
+
+@receiver(m2m_changed, sender=Follow)
+def follows_added(sender, instance, action, reverse, pk_set, **kwargs):
+    if action != 'post_add' or not pk_set:
+        return
+    if reverse:
+        edges = [(pk, instance.pk) for pk in pk_set]
+    else:
+        edges = [(instance.pk, pk) for pk in pk_set]
+    outbox.record([
+        NotificationEvent(recipient_id=following_id, actor_id=follower_id, verb=Verb.FOLLOW)
+        for following_id, follower_id in edges
+    ])
@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from posts.models import Post
+from .models import Notification, NotificationEvent
+from .outbox import process_outbox
+
+User = get_user_model()
+
+
+class NotificationTestCase(TestCase):
+    """
+    Tests for the notification outbox, coalescing and the unread list.
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create(username='author')
+        self.post = Post.objects.create(author=self.author, title='Hello', content='Body')
+        self.commenters = [
+            User.objects.create(username=f'commenter{i}')
+            for i in range(5)
+        ]
+    
+    def comment(self, user, post=None):
+        post = post or self.post
+        self.client.force_authenticate(user=user)
+        response = self.client.post(f'/api/posts/{post.id}/add_comment/', {'post': post.id, 'content': 'Nice'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+    
+    def get_unread(self, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get('/api/notifications/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['results']
+    
+    def test_comment_only_writes_outbox_row(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.comment(self.commenters[0])
+        self.assertEqual(NotificationEvent.objects.count(), 1)
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(len(callbacks), 1)
+    
+    def test_comments_are_coalesced(self):
+        for user in self.commenters:
+            self.comment(user)
+        self.comment(self.commenters[0])
+        self.assertEqual(process_outbox(), 6)
+        self.assertFalse(NotificationEvent.objects.exists())
+        
+        results = self.get_unread(self.author)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['actor_count'], 5)
+        self.assertEqual(results[0]['message'], 'commenter0 and 4 others commented on your post')
+    
+    def test_own_comments_do_not_notify(self):
+        self.comment(self.author)
+        self.assertFalse(NotificationEvent.objects.exists())
+    
+    def test_read_notifications_start_a_new_one(self):
+        self.comment(self.commenters[0])
+        process_outbox()
+        self.client.force_authenticate(user=self.author)
+        response = self.client.post('/api/notifications/read/', {}, format='json')
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(self.get_unread(self.author), [])
+        
+        self.comment(self.commenters[1])
+        process_outbox()
+        results = self.get_unread(self.author)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['message'], 'commenter1 commented on your post')
+    
+    def test_follows_are_coalesced(self):
+        self.author.followers.add(*self.commenters[:2])
+        process_outbox()
+        results = self.get_unread(self.author)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['verb'], 'follow')
+        self.assertEqual(results[0]['actor_count'], 2)
+    
+    def test_bulk_comments_notify(self):
+        self.client.force_authenticate(user=self.commenters[0])
+        response = self.client.post(
+            '/api/comments/bulk/', [{'post': self.post.id, 'content': 'One'}, {'post': self.post.id, 'content': 'Two'}],
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        process_outbox()
+        results = self.get_unread(self.author)
+        self.assertEqual(results[0]['actor_count'], 1)
+    
+    @override_settings(NOTIFICATIONS_ASYNC=False)
+    def test_commit_wakes_worker(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.comment(self.commenters[0])
+        self.assertFalse(NotificationEvent.objects.exists())
+        self.assertEqual(len(self.get_unread(self.author)), 1)
+    
+    def test_unread_list_query_count(self):
+        other = Post.objects.create(author=self.author, title='Other', content='Body')
+        for user in self.commenters:
+            self.comment(user)
+            self.comment(user, other)
+        process_outbox()
+        self.client.force_authenticate(user=self.author)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/notifications/')
+        self.assertEqual(len(response.data['results']), 2)
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import UnreadNotificationListView, MarkReadView
+
+urlpatterns = [
+    path('', UnreadNotificationListView.as_view(), name='notification-list'),
+    path('read/', MarkReadView.as_view(), name='notification-read'),
+]
@@ -0,0 +1,39 @@
+from rest_framework import generics, serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .models import Notification
+from .pagination import NotificationPagination
+from .serializers import NotificationSerializer
+
+
+class UnreadNotificationListView(generics.ListAPIView):
+    """
+    The current user's unread notifications, most recently active first.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = NotificationSerializer
+    pagination_class = NotificationPagination
+    
+    def get_queryset(self):
+        return Notification.objects.filter(
+            recipient=self.request.user, is_read=False
+        ).select_related('latest_actor')
+
+
+class MarkReadView(APIView):
+    """
+    Mark notifications read: ``{"ids": [1, 2]}``, or every unread one when
+    ``ids`` is omitted. Later events start a new notification.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        notifications = Notification.objects.filter(recipient=request.user, is_read=False)
+        ids = request.data.get('ids')
+        if ids is not None:
+            if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+                raise serializers.ValidationError({'ids': 'Expected a list of notification ids.'})
+            notifications = notifications.filter(pk__in=ids)
+        updated = notifications.update(is_read=True)
+        return Response({'updated': updated}, status=status.HTTP_200_OK)
@@ -0,0 +1,120 @@
+"""
+Bulk ingestion of posts and comments.
+
+Items are validated one by one with the regular serializer fields (without
+instantiating a serializer per item), then inserted with ``bulk_create`` in
+chunked transactions. ``bulk_create`` bypasses ``post_save``, so the work the
+signal handlers would do (counters, feed fan-out, auth cache, notifications)
+is done here in aggregate per chunk.
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from rest_framework import serializers
+from notifications.outbox import record_comments
+from .feed import fan_out_posts
+from .models import Post, Comment
+from .serializers import PostSerializer, CommentSerializer
+
+
+def get_bulk_chunk_size():
+    return getattr(settings, 'POSTS_BULK_CHUNK_SIZE', 500)
+
+
+def get_bulk_max_items():
+    return getattr(settings, 'POSTS_BULK_MAX_ITEMS', 10000)
+
+
+def _validate(serializer, items):
+    """
+    Validate each item, returning ``(valid, results)`` where ``valid`` is a
+    list of ``(index, validated_data)`` and ``results`` has an error entry
+    for every invalid item.
+    """
+    valid, results = [], {}
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, serializer.run_validation(item)))
+        except serializers.ValidationError as exc:
+            results[index] = {'index': index, 'status': 400, 'errors': exc.detail}
+    return valid, results
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def bulk_create_posts(items, author):
+    """
+    Create posts from a list of ``PostSerializer`` payloads written by ``author``.
+
+    Returns one result per item, in input order.
+    """
+    valid, results = _validate(PostSerializer(), items)
+    for chunk in _chunks(valid, get_bulk_chunk_size()):
+        with transaction.atomic():
+            posts = Post.objects.bulk_create([Post(author=author, **data) for _, data in chunk])
+            type(author).objects.filter(pk=author.pk).update(post_count=F('post_count') + len(posts))
+            fan_out_posts(posts)
+        for (index, _), post in zip(chunk, posts):
+            results[index] = {'index': index, 'status': 201, 'id': post.pk}
+    return [results[index] for index in range(len(items))]
+
+
+class _PreloadedPostField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves post ids against a dict loaded once per request instead of
+    issuing a query per item.
+    """
+    
+    def __init__(self, posts, **kwargs):
+        self.posts = posts
+        super().__init__(queryset=Post.objects.none(), **kwargs)
+    
+    def to_internal_value(self, data):
+        # As PrimaryKeyRelatedField: booleans and non-integral numbers are
+        # the wrong type rather than an id.
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if isinstance(data, float) and data != pk:
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return self.posts[pk]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+
+def bulk_create_comments(items, author):
+    """
+    Create comments from a list of ``CommentSerializer`` payloads written by ``author``.
+
+    Returns one result per item, in input order.
+    """
+    post_ids = set()
+    for item in items:
+        try:
+            post_ids.add(int(item.get('post')))
+        except (AttributeError, TypeError, ValueError):
+            pass
+    serializer = CommentSerializer()
+    posts = Post.objects.only('pk', 'author_id').in_bulk(post_ids)
+    serializer.fields['post'] = _PreloadedPostField(posts)
+    
+    valid, results = _validate(serializer, items)
+    for chunk in _chunks(valid, get_bulk_chunk_size()):
+        with transaction.atomic():
+            comments = Comment.objects.bulk_create([Comment(author=author, **data) for _, data in chunk])
+            per_post = Counter(comment.post_id for comment in comments)
+            for post_id, count in per_post.items():
+                Post.objects.filter(pk=post_id).update(comment_count=F('comment_count') + count)
+            record_comments(comments, {pk: post.author_id for pk, post in posts.items()})
+        for (index, _), comment in zip(chunk, comments):
+            results[index] = {'index': index, 'status': 201, 'id': comment.pk}
+    return [results[index] for index in range(len(items))]
@@ -0,0 +1,51 @@
+"""
+Streaming NDJSON export of a user's posts and comments.
+
+Rows are read with ``.values().iterator(chunk_size=...)`` (server-side
+cursors where the database supports them) and encoded one line at a time,
+so memory use does not grow with the amount of exported data.
+"""
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from .models import Post, Comment
+
+EXPORT_CHUNK_SIZE = 2000
+POST_FIELDS = ('id', 'title', 'content', 'created_at', 'updated_at')
+COMMENT_FIELDS = ('id', 'post_id', 'content', 'created_at', 'updated_at')
+
+
+def iter_user_content(user, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield one dict per post, then one per comment, written by ``user``.
+    """
+    posts = Post.objects.filter(author=user).order_by('id').values(*POST_FIELDS)
+    for post in posts.iterator(chunk_size=chunk_size):
+        yield {'type': 'post', **post}
+    comments = Comment.objects.filter(author=user).order_by('id').values(*COMMENT_FIELDS)
+    for comment in comments.iterator(chunk_size=chunk_size):
+        yield {'type': 'comment', **comment}
+
+
+def iter_ndjson(records):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for record in records:
+        yield (encoder.encode(record) + '\n').encode('utf-8')
+
+
+def iter_gzip(chunks, level=6):
+    """
+    Gzip a stream of byte chunks incrementally.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(user, compress=False, chunk_size=EXPORT_CHUNK_SIZE):
+    chunks = iter_ndjson(iter_user_content(user, chunk_size=chunk_size))
+    return iter_gzip(chunks) if compress else chunks
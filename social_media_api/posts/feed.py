@@ -0,0 +1,110 @@
+"""
+Home timeline maintenance.
+
+Posts are fanned out on write: creating a post appends a ``TimelineEntry``
+for the author and each of their followers. Authors with more followers than
+``FEED_FANOUT_LIMIT`` are skipped at write time; their posts are flagged
+``fanout_on_read`` and merged into followers' feeds when the feed is read.
+
+Following an account backfills its latest ``FEED_BACKFILL_POSTS`` posts into
+the follower's timeline; unfollowing removes that account's entries.
+"""
+from django.conf import settings
+from django.db.models import F, Q
+from accounts.models import Follow
+from .models import Post, TimelineEntry
+
+FANOUT_BATCH_SIZE = 1000
+
+
+def get_fanout_limit():
+    return getattr(settings, 'FEED_FANOUT_LIMIT', 10000)
+
+
+def get_backfill_limit():
+    return getattr(settings, 'FEED_BACKFILL_POSTS', 20)
+
+
+def fan_out_post(post):
+    """
+    Append ``post`` to the timelines of its author and the author's followers.
+
+    Returns the number of timeline rows written.
+    """
+    return fan_out_posts([post])
+
+
+def fan_out_posts(posts):
+    """
+    Fan out a batch of posts, reading each author's followers once.
+
+    Returns the number of timeline rows written.
+    """
+    limit = get_fanout_limit()
+    by_author = {}
+    for post in posts:
+        by_author.setdefault(post.author_id, []).append(post)
+    
+    written = 0
+    for author_id, author_posts in by_author.items():
+        follower_ids = list(
+            Follow.objects.filter(following_id=author_id).values_list('follower_id', flat=True)[:limit + 1]
+        )
+        if len(follower_ids) > limit:
+            # Too many followers to write to: readers pull these posts instead.
+            Post.objects.filter(pk__in=[post.pk for post in author_posts]).update(fanout_on_read=True)
+            for post in author_posts:
+                post.fanout_on_read = True
+            follower_ids = []
+        
+        user_ids = [author_id] + follower_ids
+        entries = [
+            TimelineEntry(user_id=user_id, post=post, created_at=post.created_at)
+            for post in author_posts
+            for user_id in user_ids
+        ]
+        TimelineEntry.objects.bulk_create(
+            entries, batch_size=FANOUT_BATCH_SIZE, ignore_conflicts=True
+        )
+        written += len(entries)
+    return written
+
+
+def backfill_timeline(user_id, author_id):
+    """
+    Copy the latest posts of a newly followed author into ``user_id``'s timeline.
+    """
+    posts = Post.objects.filter(author_id=author_id, fanout_on_read=False).order_by('-created_at', '-id')
+    entries = [
+        TimelineEntry(user_id=user_id, post_id=post_id, created_at=created_at)
+        for post_id, created_at in posts.values_list('id', 'created_at')[:get_backfill_limit()]
+    ]
+    TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+    return len(entries)
+
+
+def prune_timeline(user_id, author_id):
+    """
+    Drop an unfollowed author's posts from ``user_id``'s timeline.
+    """
+    return TimelineEntry.objects.filter(user_id=user_id, post__author_id=author_id).delete()[0]
+
+
+def get_feed_queryset(user):
+    """
+    Return the posts in ``user``'s home timeline, newest first.
+
+    Each post is annotated with ``feed_created_at``, its position in the feed.
+    """
+    queryset = Post.objects.filter(timeline_entries__user=user).annotate(
+        feed_created_at=F('timeline_entries__created_at')
+    )
+    followed = Follow.objects.filter(follower=user).values('following_id')
+    pulled = Post.objects.filter(fanout_on_read=True, author__in=followed)
+    if pulled.exists():
+        # Hybrid read: merge in posts from high-fanout accounts.
+        entries = TimelineEntry.objects.filter(user=user).values('post_id')
+        queryset = Post.objects.filter(
+            Q(id__in=entries) | Q(fanout_on_read=True, author__in=followed)
+        ).annotate(feed_created_at=F('created_at'))
+    return queryset.order_by('-feed_created_at', '-id')
@@ -0,0 +1,45 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from posts.export import EXPORT_CHUNK_SIZE, iter_export
+
+
+class Command(BaseCommand):
+    help = "Exports a user's posts and comments as NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('--output', '-o', help='File to write to (defaults to stdout)')
+        parser.add_argument('--gzip', action='store_true', help='Gzip the output')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist")
+
+        chunks = iter_export(user, compress=options['gzip'], chunk_size=options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+        else:
+            self.write_stdout(chunks, options['gzip'])
+
+    def write_stdout(self, chunks, compressed):
+        # Through self.stdout so call_command(stdout=...) captures the output.
+        # Bytes go to the underlying binary stream where there is one (the
+        # console's buffer, or a BytesIO); text streams get decoded NDJSON.
+        out = getattr(self.stdout._out, 'buffer', self.stdout._out)
+        if not isinstance(out, io.TextIOBase):
+            for chunk in chunks:
+                out.write(chunk)
+            out.flush()
+        elif compressed:
+            raise CommandError('Gzipped output needs --output or a binary stdout')
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending='')
@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from accounts.models import Follow
+from posts.models import Post, Comment
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Recomputes denormalized post and user counters in batches and fixes any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        fixed_posts = self.reconcile(Post, batch_size, {
+            'comment_count': (Comment.objects, 'post_id'),
+        })
+        fixed_users = self.reconcile(User, batch_size, {
+            'post_count': (Post.objects, 'author_id'),
+            'follower_count': (Follow.objects, 'following_id'),
+            'following_count': (Follow.objects, 'follower_id'),
+        })
+        self.stdout.write(self.style.SUCCESS(
+            f'Fixed counters on {fixed_posts} posts and {fixed_users} users'
+        ))
+
+    def reconcile(self, model, batch_size, counters):
+        """
+        Walk ``model`` in primary-key order, setting each counter field that
+        differs from a count over its source rows. ``counters`` maps the field
+        name to a (manager, foreign key column) pair.
+
+        Each batch is corrected by a single ``UPDATE ... SET field = (SELECT
+        COUNT(*) ...)``, so the count and the write happen in one statement
+        and cannot overwrite increments made by the signals in between.
+        """
+        counts = {
+            field: Coalesce(Subquery(
+                manager.filter(**{column: OuterRef('pk')}).order_by().values(column).annotate(
+                    count=Count('pk')
+                ).values('count')
+            ), 0)
+            for field, (manager, column) in counters.items()
+        }
+        fixed = 0
+        last_pk = 0
+        while True:
+            pks = list(model.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return fixed
+            batch = model.objects.filter(pk__gt=last_pk, pk__lte=pks[-1])
+            last_pk = pks[-1]
+            # Only rows where some counter is off are written (and counted).
+            fixed += batch.exclude(**counts).update(**counts)
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from posts.search import get_search_backend
+    backend = get_search_backend(schema_editor.connection.vendor)
+    if backend is not None:
+        backend.install(schema_editor)
+        backend.rebuild(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    from posts.search import get_search_backend
+    backend = get_search_backend(schema_editor.connection.vendor)
+    if backend is not None:
+        backend.uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0002_timeline'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
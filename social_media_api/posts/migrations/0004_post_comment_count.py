@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:04
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    comment_count = Comment.objects.filter(post=OuterRef('pk')).values('post').annotate(
+        count=Count('id')
+    ).values('count')
+    Post.objects.update(comment_count=Coalesce(Subquery(comment_count), 0))
+    post_count = Post.objects.filter(author=OuterRef('pk')).values('author').annotate(
+        count=Count('id')
+    ).values('count')
+    CustomUser.objects.update(post_count=Coalesce(Subquery(post_count), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_counters'),
+        ('posts', '0003_post_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,31 @@
 from django.db import models
+from django.db.models import Prefetch
 from django.conf import settings
 
+
+def get_embedded_comment_limit():
+    return getattr(settings, 'POSTS_EMBEDDED_COMMENTS', 3)
+
+
+class PostQuerySet(models.QuerySet):
+    def with_comment_preview(self):
+        """
+        Load everything PostSerializer renders in a fixed number of queries:
+        authors are joined and the latest comments (with their authors) are
+        prefetched into ``recent_comments``.
+        """
+        return self.select_related('author').with_recent_comments()
+    
+    def with_recent_comments(self):
+        """
+        Prefetch the latest comments (with their authors) into ``recent_comments``.
+        """
+        recent = Comment.objects.select_related('author').order_by('-created_at', '-id')
+        return self.prefetch_related(
+            Prefetch('comments', queryset=recent[:get_embedded_comment_limit()], to_attr='recent_comments')
+        )
+
+
 class Post(models.Model):
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -11,6 +36,27 @@ class Post(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set when the author had too many followers to fan the post out on
+    # write; such posts are merged into followers' feeds at read time.
+    fanout_on_read = models.BooleanField(default=False)
+    # Maintained by posts.signals; see the reconcile_counters command.
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    objects = PostQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            # Post list and keyset pagination.
+            models.Index(fields=['-created_at', '-id'], name='post_created_idx'),
+            # ?author= filter and per-author listings.
+            models.Index(fields=['author', '-created_at'], name='post_author_created_idx'),
+            # Hybrid feed reads of high-fanout authors.
+            models.Index(
+                fields=['author', '-created_at'],
+                condition=models.Q(fanout_on_read=True),
+                name='post_fanout_on_read_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} by {self.author.username}"
@@ -30,5 +76,44 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        indexes = [
+            # Per-post comment listing in (created_at, id) order.
+            models.Index(fields=['post', 'created_at'], name='comment_post_created_idx'),
+            # Latest comment update per post, for the post detail ETag.
+            models.Index(fields=['post', '-updated_at'], name='comment_post_updated_idx'),
+        ]
+    
     def __str__(self):
         return f"Comment by {self.author.username} on {self.post.title}"
+
+class TimelineEntry(models.Model):
+    """
+    A materialized home timeline row: ``post`` appears in ``user``'s feed.
+
+    Rows are written when a post is created (fan-out on write) so reading a
+    feed is a single range scan over ``(user, created_at)``.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries'
+    )
+    # Copied from post.created_at so the feed index covers the sort key.
+    created_at = models.DateTimeField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'], name='unique_timeline_entry'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-post'], name='timeline_user_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Post {self.post_id} in timeline of user {self.user_id}"
@@ -0,0 +1,28 @@
+from core.pagination import KeysetPagination
+
+
+class PostPagination(KeysetPagination):
+    """
+    Newest posts first, keyed on ``(created_at, id)``. Search results are
+    ordered by relevance instead, keyed on ``(search_rank, id)``.
+    """
+    ordering = ('-created_at', '-id')
+    
+    def get_ordering(self, request, queryset, view):
+        if 'search_rank' in queryset.query.annotations:
+            return ('-search_rank', '-id')
+        return self.ordering
+
+
+class CommentPagination(KeysetPagination):
+    """
+    Comments in the order they were written, keyed on ``(created_at, id)``.
+    """
+    ordering = ('created_at', 'id')
+
+
+class FeedPagination(KeysetPagination):
+    """
+    Home timeline pages, keyed on the timeline entry's ``(created_at, post)``.
+    """
+    ordering = ('-feed_created_at', '-id')
@@ -0,0 +1,175 @@
+"""
+Full-text search over post titles and content.
+
+SQLite uses an external-content FTS5 table kept in sync by triggers; Postgres
+uses a GIN index over a weighted ``tsvector`` expression. Matching posts are
+annotated with ``search_rank`` (higher is more relevant). Every query term
+is matched as a prefix, so ``djan`` finds ``django``.
+"""
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+MAX_SEARCH_TERMS = 8
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+
+
+def get_search_terms(query):
+    return re.findall(r'\w+', query.lower())[:MAX_SEARCH_TERMS]
+
+
+class SQLiteSearchBackend:
+    table = 'posts_post_fts'
+    
+    def install(self, schema_editor):
+        # IF NOT EXISTS: the triggers are re-installed after every migrate
+        # because SQLite table rebuilds drop them.
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+            "title, content, content='posts_post', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {self.table}({self.table}, rank) "
+            f"VALUES ('rank', 'bm25({TITLE_WEIGHT}, {CONTENT_WEIGHT})')"
+        )
+        insert = (
+            f"INSERT INTO {self.table}(rowid, title, content) "
+            "VALUES (new.id, new.title, new.content);"
+        )
+        delete = (
+            f"INSERT INTO {self.table}({self.table}, rowid, title, content) "
+            "VALUES ('delete', old.id, old.title, old.content);"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {self.table}_ai AFTER INSERT ON posts_post "
+            f"BEGIN {insert} END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {self.table}_ad AFTER DELETE ON posts_post "
+            f"BEGIN {delete} END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {self.table}_au AFTER UPDATE OF title, content ON posts_post "
+            f"BEGIN {delete} {insert} END"
+        )
+    
+    def rebuild(self, schema_editor):
+        schema_editor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+    
+    def uninstall(self, schema_editor):
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {self.table}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {self.table}")
+    
+    def search(self, queryset, terms):
+        match = ' '.join('"%s"*' % term for term in terms)
+        return queryset.extra(
+            tables=[self.table],
+            where=[f'{self.table}.rowid = posts_post.id', f'{self.table} MATCH %s'],
+            params=[match],
+        ).annotate(
+            search_rank=RawSQL(f'-{self.table}.rank', [], output_field=FloatField())
+        )
+
+
+class PostgresSearchBackend:
+    index = 'posts_post_search_idx'
+    document = (
+        "(setweight(to_tsvector('english', coalesce(posts_post.title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(posts_post.content, '')), 'B'))"
+    )
+    
+    def install(self, schema_editor):
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.index} ON posts_post USING GIN ({self.document})"
+        )
+    
+    def rebuild(self, schema_editor):
+        pass
+    
+    def uninstall(self, schema_editor):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {self.index}")
+    
+    def search(self, queryset, terms):
+        tsquery = ' & '.join('%s:*' % term for term in terms)
+        return queryset.extra(
+            where=[f"{self.document} @@ to_tsquery('english', %s)"],
+            params=[tsquery],
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank({self.document}, to_tsquery('english', %s))",
+                [tsquery],
+                output_field=FloatField(),
+            )
+        )
+
+
+def get_search_backend(vendor=None):
+    vendor = vendor or connection.vendor
+    if vendor == 'postgresql':
+        return PostgresSearchBackend()
+    if vendor == 'sqlite':
+        return SQLiteSearchBackend()
+    return None
+
+
+def search_posts(queryset, query):
+    """
+    Restrict ``queryset`` to posts matching ``query``, annotated with
+    ``search_rank``. Falls back to substring matching on other databases.
+    """
+    terms = get_search_terms(query)
+    if not terms:
+        return queryset.none()
+    backend = get_search_backend()
+    if backend is None:
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(content__icontains=term))
+        return queryset
+    return backend.search(queryset, terms)
+
+
+def install_search_index(sender, using='default', **kwargs):
+    """
+    ``post_migrate`` handler making sure the search index and its triggers
+    exist after any migration that rebuilt the posts table.
+    """
+    from django.db import connections
+    from django.db.migrations.recorder import MigrationRecorder
+    
+    db = connections[using]
+    backend = get_search_backend(db.vendor)
+    if backend is None:
+        return
+    applied = MigrationRecorder(db).applied_migrations()
+    if ('posts', '0003_post_search') not in applied:
+        return
+    with db.schema_editor() as schema_editor:
+        backend.install(schema_editor)
+
+
+class PostSearchFilter(filters.BaseFilterBackend):
+    """
+    Full-text ``?search=`` filter; results are ranked by relevance.
+    """
+    search_param = filters.SearchFilter.search_param
+    
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_posts(queryset, query)
+    
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Full-text search over title and content.',
+            'schema': {'type': 'string'},
+        }]
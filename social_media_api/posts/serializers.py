@@ -1,5 +1,9 @@
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from rest_framework import serializers
-from .models import Post, Comment
+from core.fast_serializers import ValuesSerializer
+from core.fieldsets import SparseFieldsetMixin
+from .models import Post, Comment, get_embedded_comment_limit
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -12,11 +16,53 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ['id', 'post', 'author', 'content', 'created_at', 'updated_at']
         read_only_fields = ['id', 'author', 'created_at', 'updated_at']
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Posts embed only their latest ``POSTS_EMBEDDED_COMMENTS`` comments, newest
+    first, plus the total ``comment_count``; the full list is paginated at
+    ``/posts/<id>/comments/``. Querysets built with
+    ``Post.objects.with_comment_preview()`` serialize without extra queries.
+
+    GET requests may shape the output with ``?fields=``, ``?exclude=`` and
+    ``?expand=comments`` (see core.fieldsets).
+    """
     author = serializers.ReadOnlyField(source='author.username')
-    comments = CommentSerializer(many=True, read_only=True)
+    comments = serializers.SerializerMethodField()
     
     class Meta:
         model = Post
-        fields = ['id', 'author', 'title', 'content', 'created_at', 'updated_at', 'comments']
-        read_only_fields = ['id', 'author', 'created_at', 'updated_at', 'comments']
+        fields = ['id', 'author', 'title', 'content', 'created_at', 'updated_at', 'comments', 'comment_count']
+        read_only_fields = ['id', 'author', 'created_at', 'updated_at', 'comments', 'comment_count']
+        expandable_fields = ['comments']
+    
+    def get_comments(self, obj):
+        comments = getattr(obj, 'recent_comments', None)
+        if comments is None:
+            comments = obj.comments.select_related('author').order_by(
+                '-created_at', '-id'
+            )[:get_embedded_comment_limit()]
+        return CommentSerializer(comments, many=True).data
+
+
+class FastCommentSerializer(ValuesSerializer):
+    """
+    Read-only ``CommentSerializer`` output built from ``.values()`` rows.
+    """
+    serializer_class = CommentSerializer
+
+
+class FastPostSerializer(ValuesSerializer):
+    """
+    Read-only ``PostSerializer`` output built from ``.values()`` rows, for
+    list endpoints. The embedded comments come from one windowed query.
+    """
+    serializer_class = PostSerializer
+    
+    def get_comments_map(self, pks):
+        latest = Comment.objects.filter(post_id__in=pks).annotate(
+            position=Window(RowNumber(), partition_by=F('post_id'), order_by=(F('created_at').desc(), F('id').desc()))
+        ).filter(position__lte=get_embedded_comment_limit()).order_by('post_id', '-created_at', '-id')
+        comments = {}
+        for comment in FastCommentSerializer().serialize(latest):
+            comments.setdefault(comment['post'], []).append(comment)
+        return comments
@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from accounts.models import Follow
+from .feed import backfill_timeline, prune_timeline
+from .models import Post, Comment
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Post)
+def increment_post_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        User.objects.filter(pk=instance.author_id).update(post_count=F('post_count') + 1)
+
+
+@receiver(post_delete, sender=Post)
+def decrement_post_count(sender, instance, **kwargs):
+    User.objects.filter(pk=instance.author_id, post_count__gt=0).update(post_count=F('post_count') - 1)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(comment_count=F('comment_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(comment_count=F('comment_count') - 1)
+
+
+@receiver(post_save, sender=Follow)
+def backfill_followed_posts(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        backfill_timeline(instance.follower_id, instance.following_id)
+
+
+@receiver(m2m_changed, sender=Follow)
+def backfill_added_follows(sender, instance, action, reverse, pk_set, **kwargs):
+    if action != 'post_add' or not pk_set:
+        return
+    for pk in pk_set:
+        if reverse:
+            backfill_timeline(instance.pk, pk)
+        else:
+            backfill_timeline(pk, instance.pk)
+
+
+@receiver(post_delete, sender=Follow)
+def prune_unfollowed_posts(sender, instance, **kwargs):
+    prune_timeline(instance.follower_id, instance.following_id)
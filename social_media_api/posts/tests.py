@@ -1,3 +1,732 @@
-from django.test import TestCase
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from .models import Post, TimelineEntry
 
-# Create your tests here.
+User = get_user_model()
+
+
+class FeedTestCase(TestCase):
+    """
+    Tests for the fan-out-on-write home timeline.
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='testpassword123')
+        self.follower = User.objects.create_user(username='follower', password='testpassword123')
+        self.stranger = User.objects.create_user(username='stranger', password='testpassword123')
+        self.author.followers.add(self.follower)
+    
+    def create_post(self, title='Hello'):
+        self.client.force_authenticate(user=self.author)
+        response = self.client.post('/api/posts/', {'title': title, 'content': 'Body'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Post.objects.get(pk=response.data['id'])
+    
+    def get_feed_titles(self, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get('/api/feed/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post['title'] for post in response.data['results']]
+    
+    def test_create_post_fans_out_to_author_and_followers(self):
+        post = self.create_post()
+        self.assertEqual(
+            set(TimelineEntry.objects.filter(post=post).values_list('user_id', flat=True)),
+            {self.author.id, self.follower.id}
+        )
+        self.assertFalse(post.fanout_on_read)
+    
+    def test_feed_lists_followed_posts_newest_first(self):
+        self.create_post('First')
+        self.create_post('Second')
+        self.assertEqual(self.get_feed_titles(self.follower), ['Second', 'First'])
+        self.assertEqual(self.get_feed_titles(self.stranger), [])
+    
+    def test_follow_backfills_and_unfollow_prunes(self):
+        self.create_post('Earlier')
+        self.assertEqual(self.get_feed_titles(self.stranger), [])
+        self.stranger.following.add(self.author)
+        self.assertEqual(self.get_feed_titles(self.stranger), ['Earlier'])
+        self.stranger.following.remove(self.author)
+        self.assertEqual(self.get_feed_titles(self.stranger), [])
+    
+    @override_settings(FEED_FANOUT_LIMIT=0)
+    def test_high_fanout_author_is_merged_on_read(self):
+        post = self.create_post('Popular')
+        self.assertTrue(post.fanout_on_read)
+        self.assertFalse(TimelineEntry.objects.filter(user=self.follower).exists())
+        self.assertEqual(self.get_feed_titles(self.follower), ['Popular'])
+        self.assertEqual(self.get_feed_titles(self.stranger), [])
+    
+    def test_feed_requires_authentication(self):
+        response = self.client.get('/api/feed/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class KeysetPaginationTestCase(TestCase):
+    """
+    Tests for cursor pagination on the post and comment endpoints.
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='author', password='testpassword123')
+        self.posts = [
+            Post.objects.create(author=self.user, title=f'Post {i}', content='Body')
+            for i in range(5)
+        ]
+    
+    def get_titles(self, response):
+        return [post['title'] for post in response.data['results']]
+    
+    def test_pages_forward_and_backward(self):
+        first = self.client.get('/api/posts/?page_size=2')
+        self.assertEqual(self.get_titles(first), ['Post 4', 'Post 3'])
+        self.assertIsNone(first.data['previous'])
+        
+        second = self.client.get(first.data['next'])
+        self.assertEqual(self.get_titles(second), ['Post 2', 'Post 1'])
+        
+        third = self.client.get(second.data['next'])
+        self.assertEqual(self.get_titles(third), ['Post 0'])
+        self.assertIsNone(third.data['next'])
+        
+        back = self.client.get(third.data['previous'])
+        self.assertEqual(self.get_titles(back), ['Post 2', 'Post 1'])
+        back = self.client.get(back.data['previous'])
+        self.assertEqual(self.get_titles(back), ['Post 4', 'Post 3'])
+        self.assertIsNone(back.data['previous'])
+    
+    def test_pages_are_stable_under_inserts(self):
+        first = self.client.get('/api/posts/?page_size=2')
+        Post.objects.create(author=self.user, title='Newer', content='Body')
+        second = self.client.get(first.data['next'])
+        self.assertEqual(self.get_titles(second), ['Post 2', 'Post 1'])
+    
+    def test_no_count_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/posts/?page_size=2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any(query['sql'].startswith('SELECT COUNT(') for query in queries.captured_queries))
+        self.assertFalse(any('OFFSET' in query['sql'] for query in queries.captured_queries))
+    
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/posts/?cursor=garbage')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_comments_are_paginated_oldest_first(self):
+        post = self.posts[0]
+        for i in range(3):
+            post.comments.create(author=self.user, content=f'Comment {i}')
+        response = self.client.get(f'/api/posts/{post.id}/comments/?page_size=2')
+        self.assertEqual([c['content'] for c in response.data['results']], ['Comment 0', 'Comment 1'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([c['content'] for c in response.data['results']], ['Comment 2'])
+        
+        response = self.client.get(f'/api/comments/?post={post.id}&page_size=2')
+        self.assertEqual([c['content'] for c in response.data['results']], ['Comment 0', 'Comment 1'])
+
+
+@override_settings(POSTS_EMBEDDED_COMMENTS=3)
+class PostQueryCountTestCase(TestCase):
+    """
+    Listing posts must cost a fixed number of queries regardless of page size.
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        for i in range(12):
+            author = User.objects.create(username=f'author{i}')
+            post = Post.objects.create(author=author, title=f'Post {i}', content='Body')
+            for j in range(5):
+                commenter = User.objects.create(username=f'commenter{i}-{j}')
+                post.comments.create(author=commenter, content=f'Comment {j}')
+    
+    def test_constant_queries_per_page(self):
+        # One query for the page (authors joined, counts annotated) and one
+        # for the prefetched comments with their authors.
+        for page_size in (1, 5, 10):
+            with self.assertNumQueries(2):
+                response = self.client.get(f'/api/posts/?page_size={page_size}')
+            self.assertEqual(len(response.data['results']), page_size)
+    
+    def test_embeds_latest_comments_and_count(self):
+        response = self.client.get('/api/posts/?page_size=1')
+        post = response.data['results'][0]
+        self.assertEqual(post['comment_count'], 5)
+        self.assertEqual(
+            [comment['content'] for comment in post['comments']],
+            ['Comment 4', 'Comment 3', 'Comment 2']
+        )
+
+
+class ConditionalGetTestCase(TestCase):
+    """
+    Tests for ETag handling on post detail and comments.
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create(username='author')
+        self.post = Post.objects.create(author=self.author, title='Hello', content='Body')
+        self.post.comments.create(author=self.author, content='First')
+    
+    def test_post_not_modified(self):
+        response = self.client.get(f'/api/posts/{self.post.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/posts/{self.post.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+    
+    def test_post_etag_changes_with_edits_and_comments(self):
+        etag = self.client.get(f'/api/posts/{self.post.id}/')['ETag']
+        self.post.comments.create(author=self.author, content='Second')
+        response = self.client.get(f'/api/posts/{self.post.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        etag = response['ETag']
+        self.post.title = 'Edited'
+        self.post.save()
+        response = self.client.get(f'/api/posts/{self.post.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_comments_etag_changes_on_delete(self):
+        response = self.client.get(f'/api/posts/{self.post.id}/comments/')
+        etag = response['ETag']
+        response = self.client.get(f'/api/posts/{self.post.id}/comments/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        self.post.comments.get().delete()
+        response = self.client.get(f'/api/posts/{self.post.id}/comments/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+    
+    def test_if_modified_since_after_comment_delete(self):
+        from django.utils.http import http_date
+        since = http_date()
+        self.post.comments.get().delete()
+        for url in (f'/api/posts/{self.post.id}/', f'/api/posts/{self.post.id}/comments/'):
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('Last-Modified', response)
+    
+    def test_unknown_post(self):
+        response = self.client.get('/api/posts/999/', HTTP_IF_NONE_MATCH='W/"x"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(THROTTLE_STORE='core.throttling.LocMemBucketStore')
+class ThrottlingTestCase(TestCase):
+    """
+    Tests for token-bucket throttling and the X-RateLimit headers.
+    """
+    
+    def setUp(self):
+        from core.throttling import get_store
+        get_store().clear()
+        self.client = APIClient()
+        self.user = User.objects.create(username='author')
+        self.client.force_authenticate(user=self.user)
+    
+    def create_post(self):
+        return self.client.post('/api/posts/', {'title': 'Hello', 'content': 'Body'})
+    
+    def test_bucket_empties_and_refills(self):
+        from unittest import mock
+        with override_settings(REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'posts_create': '2/min'},
+        }):
+            with mock.patch('core.throttling.time.time', return_value=1000.0):
+                self.assertEqual(self.create_post()['X-RateLimit-Remaining'], '1')
+                self.assertEqual(self.create_post()['X-RateLimit-Remaining'], '0')
+                response = self.create_post()
+                self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+                self.assertEqual(response['Retry-After'], '30')
+                self.assertEqual(response['X-RateLimit-Limit'], '2')
+                # Reading is a different scope and is not throttled here.
+                self.assertEqual(self.client.get('/api/posts/').status_code, status.HTTP_200_OK)
+            with mock.patch('core.throttling.time.time', return_value=1030.0):
+                self.assertEqual(self.create_post().status_code, status.HTTP_201_CREATED)
+    
+    def test_buckets_are_per_user(self):
+        with override_settings(REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'posts_create': '1/min'},
+        }):
+            self.assertEqual(self.create_post().status_code, status.HTTP_201_CREATED)
+            self.assertEqual(self.create_post().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.client.force_authenticate(user=User.objects.create(username='other'))
+            self.assertEqual(self.create_post().status_code, status.HTTP_201_CREATED)
+    
+    def test_cache_store(self):
+        from core.throttling import CacheBucketStore
+        from django.core.cache import cache
+        cache.clear()
+        store = CacheBucketStore()
+        self.assertEqual(store.consume('bucket', 1, 1.0)[0], True)
+        self.assertEqual(store.consume('bucket', 1, 1.0)[0], False)
+
+
+class IdempotencyTestCase(TestCase):
+    """
+    Tests for Idempotency-Key replays on post and comment creation.
+    """
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create(username='author')
+        self.client.force_authenticate(user=self.user)
+    
+    def create_post(self, key, title='Hello'):
+        return self.client.post(
+            '/api/posts/', {'title': title, 'content': 'Body'}, format='json', HTTP_IDEMPOTENCY_KEY=key
+        )
+    
+    def test_retry_replays_response_without_writing(self):
+        first = self.create_post('retry-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        with self.assertNumQueries(0):
+            retry = self.create_post('retry-1')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Post.objects.count(), 1)
+        self.assertEqual(self.create_post('retry-2').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Post.objects.count(), 2)
+    
+    def test_key_reused_for_other_request(self):
+        self.create_post('reused')
+        response = self.create_post('reused', title='Different')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Post.objects.count(), 1)
+    
+    def test_request_in_progress_conflicts(self):
+        from django.core.cache import cache
+        from core.idempotency import fingerprint, get_cache_key
+        from rest_framework.test import APIRequestFactory
+        request = APIRequestFactory().post('/api/posts/', {'title': 'Hello', 'content': 'Body'}, format='json')
+        request.user = self.user
+        cache.set(get_cache_key(request, 'busy'), {'fingerprint': fingerprint(request), 'status': None})
+        self.assertEqual(self.create_post('busy').status_code, status.HTTP_409_CONFLICT)
+    
+    def test_keys_are_per_user(self):
+        self.create_post('shared')
+        self.client.force_authenticate(user=User.objects.create(username='other'))
+        self.assertNotIn('Idempotent-Replayed', self.create_post('shared'))
+        self.assertEqual(Post.objects.count(), 2)
+    
+    def test_add_comment_is_idempotent(self):
+        post = Post.objects.create(author=self.user, title='Post', content='Body')
+        for _ in range(2):
+            response = self.client.post(
+                f'/api/posts/{post.id}/add_comment/', {'post': post.id, 'content': 'Nice'},
+                format='json', HTTP_IDEMPOTENCY_KEY='comment-1'
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(post.comments.count(), 1)
+
+
+class SparseFieldsetTestCase(TestCase):
+    """
+    Tests for ?fields=, ?exclude= and ?expand= on post endpoints.
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create(username='author')
+        for i in range(3):
+            post = Post.objects.create(author=self.author, title=f'Post {i}', content='A long body ' * 100)
+            post.comments.create(author=self.author, content='Nice')
+    
+    def test_fields_limit_columns_and_output(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/posts/?fields=id,title,author')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'author'})
+        # One query: no comment prefetch and no content column.
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"content"', queries[0]['sql'])
+    
+    def test_exclude(self):
+        response = self.client.get('/api/posts/?exclude=content')
+        post = response.data['results'][0]
+        self.assertNotIn('content', post)
+        self.assertNotIn('comments', post)
+        self.assertIn('comment_count', post)
+    
+    def test_expand_comments(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/posts/?fields=id&expand=comments')
+        post = response.data['results'][0]
+        self.assertEqual(set(post), {'id', 'comments'})
+        self.assertEqual(post['comments'][0]['content'], 'Nice')
+    
+    def test_retrieve_and_pagination_with_fields(self):
+        post = Post.objects.first()
+        response = self.client.get(f'/api/posts/{post.id}/?fields=title')
+        self.assertEqual(response.data, {'title': post.title})
+        
+        response = self.client.get('/api/posts/?fields=id&page_size=2')
+        with self.assertNumQueries(1):
+            response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+    
+    def test_default_representation_is_unchanged(self):
+        response = self.client.get('/api/posts/')
+        self.assertIn('content', response.data['results'][0])
+        self.assertIn('comments', response.data['results'][0])
+    
+    def test_unknown_field(self):
+        response = self.client.get('/api/posts/?fields=id,secret')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/posts/?expand=title')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ORJSONRendererTestCase(TestCase):
+    """
+    The orjson renderer and parser must agree with DRF's stdlib JSON classes.
+    """
+    
+    def test_matches_json_renderer(self):
+        import datetime
+        import decimal
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+        from core.renderers import ORJSONRenderer
+        data = {
+            'text': 'caf\u00e9 \u2028 line',
+            'lazy': gettext_lazy('Not found.'),
+            'when': datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2024, 5, 1),
+            'price': decimal.Decimal('1.50'),
+            'nested': [{'id': 1, 'tags': ['a', 'b']}, None, True],
+            7: 'int key',
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+    
+    def test_indented_responses_fall_back(self):
+        from rest_framework.renderers import JSONRenderer
+        from core.renderers import ORJSONRenderer
+        media_type = 'application/json; indent=4'
+        self.assertEqual(
+            ORJSONRenderer().render({'a': [1]}, media_type),
+            JSONRenderer().render({'a': [1]}, media_type)
+        )
+    
+    def test_api_round_trip(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create(username='author'))
+        response = self.client.post(
+            '/api/posts/', '{"title": "Caf\u00e9", "content": "Body"}', content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['title'], 'Caf\u00e9')
+        response = self.client.post('/api/posts/', '{"title": ', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FastPostSerializerTestCase(TestCase):
+    """
+    FastPostSerializer must render byte-for-byte what PostSerializer renders.
+    """
+    
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        self.client = APIClient()
+        authors = [User.objects.create(username=name) for name in ('ana', 'b\u00f8b', 'chlo\u00eb')]
+        now = timezone.now()
+        for i in range(8):
+            post = Post.objects.create(
+                author=authors[i % 3], title=f'Post {i} \u2728', content='Body \u2028 line ' * i
+            )
+            for j in range(i % 5):
+                post.comments.create(author=authors[j % 3], content=f'Comment {j}')
+            # Identical timestamps exercise the id tie-breaker.
+            Post.objects.filter(pk=post.pk).update(created_at=now - timedelta(minutes=i // 2))
+        Post.objects.create(author=authors[0], title='No comments', content='')
+    
+    def render(self, data):
+        from rest_framework.renderers import JSONRenderer
+        return JSONRenderer().render(data)
+    
+    def assertSameOutput(self, queryset):
+        from .serializers import FastPostSerializer, PostSerializer
+        expected = PostSerializer(queryset.with_comment_preview(), many=True).data
+        self.assertEqual(self.render(FastPostSerializer().serialize(queryset)), self.render(expected))
+    
+    def test_all_posts(self):
+        self.assertSameOutput(Post.objects.order_by('-created_at', '-id'))
+    
+    @override_settings(POSTS_EMBEDDED_COMMENTS=1)
+    def test_embedded_comment_limit(self):
+        self.assertSameOutput(Post.objects.order_by('id'))
+    
+    def test_empty(self):
+        self.assertSameOutput(Post.objects.none())
+    
+    def test_comment_serializer(self):
+        from .models import Comment
+        from .serializers import CommentSerializer, FastCommentSerializer
+        comments = Comment.objects.select_related('author').order_by('id')
+        self.assertEqual(
+            self.render(FastCommentSerializer().serialize(comments)),
+            self.render(CommentSerializer(comments, many=True).data)
+        )
+    
+    def test_list_endpoint_pages_match(self):
+        from .serializers import PostSerializer
+        url = '/api/posts/?page_size=3'
+        ids = []
+        while url:
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            page_ids = [post['id'] for post in response.data['results']]
+            expected = PostSerializer(
+                Post.objects.with_comment_preview().filter(pk__in=page_ids).order_by('-created_at', '-id'), many=True
+            ).data
+            self.assertEqual(response.content, self.render({
+                'next': response.data['next'], 'previous': response.data['previous'], 'results': expected,
+            }))
+            ids.extend(page_ids)
+            url = response.data['next']
+        self.assertEqual(ids, list(Post.objects.order_by('-created_at', '-id').values_list('id', flat=True)))
+
+
+class PostSearchTestCase(TestCase):
+    """
+    Tests for full-text post search.
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='author', password='testpassword123')
+        self.in_title = Post.objects.create(author=self.user, title='Learning Django', content='A framework')
+        self.in_content = Post.objects.create(author=self.user, title='Notes', content='Django models and more')
+        Post.objects.create(author=self.user, title='Unrelated', content='Nothing to see')
+    
+    def search(self, query, **params):
+        params['search'] = query
+        response = self.client.get('/api/posts/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+    
+    def get_ids(self, response):
+        return [post['id'] for post in response.data['results']]
+    
+    def test_ranks_title_matches_first(self):
+        response = self.search('django')
+        self.assertEqual(self.get_ids(response), [self.in_title.id, self.in_content.id])
+    
+    def test_prefix_matching(self):
+        response = self.search('djan mod')
+        self.assertEqual(self.get_ids(response), [self.in_content.id])
+    
+    def test_index_follows_updates_and_deletes(self):
+        self.in_title.title = 'Learning Flask'
+        self.in_title.save()
+        self.assertEqual(self.get_ids(self.search('flask')), [self.in_title.id])
+        self.in_content.delete()
+        self.assertEqual(self.get_ids(self.search('django')), [])
+    
+    def test_search_results_paginate_by_rank(self):
+        first = self.search('django', page_size=1)
+        self.assertEqual(self.get_ids(first), [self.in_title.id])
+        second = self.client.get(first.data['next'])
+        self.assertEqual(self.get_ids(second), [self.in_content.id])
+        self.assertIsNone(second.data['next'])
+
+
+class CounterTestCase(TestCase):
+    """
+    Tests for the denormalized post and user counters.
+    """
+    
+    def setUp(self):
+        self.author = User.objects.create(username='author')
+        self.reader = User.objects.create(username='reader')
+    
+    def test_post_and_comment_counts(self):
+        post = Post.objects.create(author=self.author, title='Post', content='Body')
+        comment = post.comments.create(author=self.reader, content='Nice')
+        post.comments.create(author=self.reader, content='Again')
+        post.refresh_from_db()
+        self.author.refresh_from_db()
+        self.assertEqual(post.comment_count, 2)
+        self.assertEqual(self.author.post_count, 1)
+        
+        comment.delete()
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 1)
+        post.delete()
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.post_count, 0)
+    
+    def test_follow_counts(self):
+        self.author.followers.add(self.reader)
+        self.author.followers.add(self.reader)
+        self.author.refresh_from_db()
+        self.reader.refresh_from_db()
+        self.assertEqual(self.author.follower_count, 1)
+        self.assertEqual(self.reader.following_count, 1)
+        
+        self.reader.following.remove(self.author)
+        self.author.refresh_from_db()
+        self.reader.refresh_from_db()
+        self.assertEqual(self.author.follower_count, 0)
+        self.assertEqual(self.reader.following_count, 0)
+    
+    def test_reconcile_counters_fixes_drift(self):
+        from django.core.management import call_command
+        from io import StringIO
+        post = Post.objects.create(author=self.author, title='Post', content='Body')
+        post.comments.create(author=self.reader, content='Nice')
+        self.author.followers.add(self.reader)
+        Post.objects.update(comment_count=7)
+        User.objects.update(post_count=3, follower_count=0)
+        
+        out = StringIO()
+        call_command('reconcile_counters', batch_size=1, stdout=out)
+        self.assertIn('Fixed counters on 1 posts and 2 users', out.getvalue())
+        post.refresh_from_db()
+        self.author.refresh_from_db()
+        self.reader.refresh_from_db()
+        self.assertEqual(post.comment_count, 1)
+        self.assertEqual(self.author.post_count, 1)
+        self.assertEqual(self.author.follower_count, 1)
+        self.assertEqual(self.reader.post_count, 0)
+
+
+class BulkIngestionTestCase(TestCase):
+    """
+    Tests for the bulk post and comment endpoints.
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create(username='author')
+        self.follower = User.objects.create(username='follower')
+        self.author.followers.add(self.follower)
+        self.client.force_authenticate(user=self.author)
+    
+    def test_bulk_create_posts(self):
+        items = [{'title': f'Post {i}', 'content': 'Body'} for i in range(3)]
+        response = self.client.post('/api/posts/bulk/', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(Post.objects.filter(author=self.author).count(), 3)
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.post_count, 3)
+        self.assertEqual(TimelineEntry.objects.filter(user=self.follower).count(), 3)
+        self.assertEqual(self.client.get('/api/posts/', {'search': 'post'}).data['results'][0]['title'], 'Post 2')
+    
+    def test_partial_failure_reports_per_item(self):
+        items = [{'title': 'Good', 'content': 'Body'}, {'title': 'Missing content'}, 'not an object']
+        response = self.client.post('/api/posts/bulk/', items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([r['status'] for r in response.data['results']], [201, 400, 400])
+        self.assertIn('content', response.data['results'][1]['errors'])
+    
+    def test_bulk_create_comments_from_ndjson(self):
+        post = Post.objects.create(author=self.author, title='Post', content='Body')
+        body = '\n'.join([
+            '{"post": %d, "content": "First"}' % post.id,
+            '{"post": %d, "content": "Second"}' % post.id,
+            '{"post": 999, "content": "Orphan"}',
+        ])
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                '/api/comments/bulk/', body, content_type='application/x-ndjson'
+            )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([r['status'] for r in response.data['results']], [201, 201, 400])
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 2)
+    
+    def test_rejects_non_list_body(self):
+        response = self.client.post('/api/posts/bulk/', {'title': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_undecodable_ndjson_is_a_parse_error(self):
+        response = self.client.post('/api/comments/bulk/', b'\xff\xfe{}', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('line 1', response.data['detail'])
+    
+    def test_comment_post_must_be_an_integer(self):
+        post = Post.objects.create(author=self.author, title='Post', content='Body')
+        items = [{'post': value, 'content': 'Hi'} for value in (True, post.id + 0.9, str(post.id))]
+        response = self.client.post('/api/comments/bulk/', items, format='json')
+        self.assertEqual([r['status'] for r in response.data['results']], [400, 400, 201])
+
+
+class ExportTestCase(TestCase):
+    """
+    Tests for the streaming NDJSON export.
+    """
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(username='writer')
+        other = User.objects.create(username='other')
+        self.post = Post.objects.create(author=self.user, title='Mine', content='Body')
+        Post.objects.create(author=other, title='Theirs', content='Body')
+        self.post.comments.create(author=self.user, content='My comment')
+        self.client.force_authenticate(user=self.user)
+    
+    def read_lines(self, data):
+        import json
+        return [json.loads(line) for line in data.decode('utf-8').splitlines()]
+    
+    def test_streams_own_posts_and_comments(self):
+        response = self.client.get('/api/export/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        records = self.read_lines(b''.join(response.streaming_content))
+        self.assertEqual([(r['type'], r.get('title', r['content'])) for r in records],
+                         [('post', 'Mine'), ('comment', 'My comment')])
+    
+    def test_gzip(self):
+        import gzip
+        response = self.client.get('/api/export/?gzip=1')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        records = self.read_lines(gzip.decompress(b''.join(response.streaming_content)))
+        self.assertEqual(len(records), 2)
+    
+    def test_management_command(self):
+        import os
+        import tempfile
+        from django.core.management import call_command
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'export.ndjson')
+            call_command('export_content', 'writer', output=path, chunk_size=1)
+            with open(path, 'rb') as export:
+                self.assertEqual(len(self.read_lines(export.read())), 2)
+    
+    def test_management_command_stdout(self):
+        import gzip
+        from io import BytesIO, StringIO
+        from django.core.management import call_command
+        out = StringIO()
+        call_command('export_content', 'writer', stdout=out)
+        self.assertEqual(len(self.read_lines(out.getvalue().encode())), 2)
+        out = BytesIO()
+        call_command('export_content', 'writer', gzip=True, stdout=out)
+        self.assertEqual(len(self.read_lines(gzip.decompress(out.getvalue()))), 2)
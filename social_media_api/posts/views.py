@@ -1,38 +1,135 @@
-from rest_framework import viewsets, filters, status
+from rest_framework import generics, viewsets, status
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.db.models import OuterRef, Subquery
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Post, Comment
-from .serializers import PostSerializer, CommentSerializer
-from rest_framework.pagination import PageNumberPagination
+from .serializers import PostSerializer, CommentSerializer, FastPostSerializer
+from .feed import fan_out_post, get_feed_queryset
+from .pagination import PostPagination, CommentPagination, FeedPagination
+from .search import PostSearchFilter
+from .bulk import bulk_create_posts, bulk_create_comments, get_bulk_max_items
+from .export import iter_export
+from core.fieldsets import SparseFieldsetViewMixin, get_fieldset
+from core.conditional import make_etag, not_modified, set_validators
+from core.idempotency import idempotent
+from core.parsers import NDJSONParser, ORJSONParser
 
-class PostPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
 
-class PostViewSet(viewsets.ModelViewSet):
+def bulk_response(request, create):
+    """
+    Run ``create(items, author)`` over a JSON array or NDJSON body and report
+    per-item results: 201 when every item was created, 207 otherwise.
+    """
+    items = request.data
+    if not isinstance(items, list):
+        return Response(
+            {'detail': 'Expected a JSON array or NDJSON stream of items.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(items) > get_bulk_max_items():
+        return Response(
+            {'detail': f'At most {get_bulk_max_items()} items can be created per request.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    results = create(items, request.user)
+    created = sum(1 for result in results if result['status'] == 201)
+    return Response({
+        'created': created,
+        'failed': len(results) - created,
+        'results': results,
+    }, status=status.HTTP_201_CREATED if created == len(results) else status.HTTP_207_MULTI_STATUS)
+
+def shape_post_queryset(view, queryset):
+    """
+    Load what the request's fieldset renders: by default the author join and
+    the comment preview; for sparse fieldsets only the selected columns, and
+    comments only when expanded.
+    """
+    fields = view.get_selected_fields()
+    if fields is None:
+        return queryset.with_comment_preview()
+    if 'comments' in fields:
+        queryset = queryset.with_recent_comments()
+    return view.only_selected(queryset, fields)
+
+class PostViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     pagination_class = PostPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, PostSearchFilter]
     filterset_fields = ['author']
-    search_fields = ['title', 'content']
+    # created_at is the pagination key, so sparse fieldsets keep it loaded.
+    always_loaded = ('pk', 'created_at')
+    throttle_scopes = {
+        'create': 'posts_create',
+        'bulk': 'posts_create',
+        'add_comment': 'comments_create',
+    }
+    
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
     
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        post = serializer.save(author=self.request.user)
+        fan_out_post(post)
     
     def get_queryset(self):
-        queryset = Post.objects.all()
-        # Filter by search query
-        search = self.request.query_params.get('search', None)
-        if search:
-            queryset = queryset.filter(title__icontains=search) | queryset.filter(content__icontains=search)
-        return queryset
+        if self.action in ('add_comment', 'comments'):
+            # Only the post row is needed to attach or list comments.
+            return Post.objects.all()
+        if self.action in ('list', 'retrieve'):
+            return shape_post_queryset(self, Post.objects.all())
+        return Post.objects.with_comment_preview()
+    
+    def list(self, request, *args, **kwargs):
+        if get_fieldset(request) is not None:
+            return super().list(request, *args, **kwargs)
+        # Read-only fast path: same output as PostSerializer, built from
+        # .values() rows instead of model instances.
+        serializer = FastPostSerializer(context=self.get_serializer_context())
+        queryset = self.filter_queryset(Post.objects.all())
+        ordering = [field.lstrip('-') for field in self.paginator.get_ordering(request, queryset, self)]
+        page = self.paginate_queryset(serializer.values(queryset, ordering))
+        return self.get_paginated_response(serializer.serialize_rows(page))
+    
+    def get_post_state(self):
+        """
+        What the post's representation depends on, read with one indexed
+        query and no serialization: its ``updated_at``, its comment count and
+        the latest comment ``updated_at``.
+        """
+        # A newest-first LIMIT 1 read from comment_post_updated_idx rather
+        # than a MAX over every comment on the post.
+        last_comment = Comment.objects.filter(post=OuterRef('pk')).order_by('-updated_at').values('updated_at')[:1]
+        state = Post.objects.values('id', 'updated_at', 'comment_count').annotate(
+            last_comment=Subquery(last_comment)
+        )
+        return get_object_or_404(state, pk=self.kwargs['pk'])
+    
+    def retrieve(self, request, *args, **kwargs):
+        state = self.get_post_state()
+        etag = make_etag('post', state['id'], state['updated_at'], state['comment_count'], state['last_comment'])
+        # No Last-Modified: deleting a comment changes comment_count but
+        # moves no timestamp forward, so only the ETag can tell.
+        response = not_modified(request, etag)
+        if response is None:
+            response = set_validators(super().retrieve(request, *args, **kwargs), etag)
+        return response
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated],
+            parser_classes=[ORJSONParser, NDJSONParser])
+    def bulk(self, request):
+        return bulk_response(request, bulk_create_posts)
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
+    @idempotent
     def add_comment(self, request, pk=None):
         post = self.get_object()
         serializer = CommentSerializer(data=request.data)
@@ -43,26 +140,76 @@ class PostViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'])
     def comments(self, request, pk=None):
-        post = self.get_object()
-        comments = post.comments.all()
-        page = self.paginate_queryset(comments)
-        if page is not None:
-            serializer = CommentSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
+        state = self.get_post_state()
+        # Deleted comments only show in the count, so it is part of the ETag;
+        # deleting the newest one moves the latest updated_at backwards, so
+        # there is no Last-Modified.
+        etag = make_etag('comments', state['id'], state['comment_count'], state['last_comment'])
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        comments = Comment.objects.filter(post_id=state['id']).select_related('author')
+        paginator = CommentPagination()
+        page = paginator.paginate_queryset(comments, request, view=self)
+        serializer = CommentSerializer(page, many=True)
+        return set_validators(paginator.get_paginated_response(serializer.data), etag)
 
 class CommentViewSet(viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = CommentPagination
+    throttle_scopes = {
+        'create': 'comments_create',
+        'bulk': 'comments_create',
+    }
+    
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
     
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
     
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated],
+            parser_classes=[ORJSONParser, NDJSONParser])
+    def bulk(self, request):
+        return bulk_response(request, bulk_create_comments)
+    
     def get_queryset(self):
-        queryset = Comment.objects.all()
+        queryset = Comment.objects.select_related('author')
         post_id = self.request.query_params.get('post', None)
         if post_id:
             queryset = queryset.filter(post_id=post_id)
         return queryset
+
+class FeedView(SparseFieldsetViewMixin, generics.ListAPIView):
+    """
+    Home timeline of the authenticated user: their own posts and posts from
+    the accounts they follow, newest first.
+    """
+    serializer_class = PostSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = FeedPagination
+    always_loaded = ('pk', 'created_at')
+    
+    def get_queryset(self):
+        return shape_post_queryset(self, get_feed_queryset(self.request.user))
+
+class ExportView(APIView):
+    """
+    Stream the authenticated user's posts and comments as NDJSON.
+    Pass ``?gzip=1`` for a gzip-compressed download.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        compress = request.query_params.get('gzip') in ('1', 'true')
+        filename = f'{request.user.username}-content.ndjson'
+        if compress:
+            response = StreamingHttpResponse(iter_export(request.user, compress=True), content_type='application/gzip')
+            filename += '.gz'
+        else:
+            response = StreamingHttpResponse(iter_export(request.user), content_type='application/x-ndjson')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
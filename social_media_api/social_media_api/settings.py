@@ -31,6 +31,7 @@ INSTALLED_APPS = [
     'rest_framework.authtoken',
     'accounts',
     'posts',  # Add this
+    'notifications',
 ]
 
 MIDDLEWARE = [
@@ -41,6 +42,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.throttling.RateLimitHeadersMiddleware',
 ]
 
 ROOT_URLCONF = 'social_media_api.urls'
@@ -122,12 +124,127 @@ AUTH_USER_MODEL = 'accounts.CustomUser'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # orjson-backed JSON; both fall back to the stdlib when orjson is missing.
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.TokenBucketThrottle',
+    ],
+    # Token buckets: 'N/period' allows bursts of N refilled at N per period.
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '300/min',
+        'user': '1200/min',
+        'login': '10/min',
+        'posts_create': '30/min',
+        'comments_create': '60/min',
+    },
 }
 
+# Where token buckets are kept: core.throttling.CacheBucketStore shares them
+# between workers through THROTTLE_CACHE_ALIAS; core.throttling.LocMemBucketStore
+# keeps them per process.
+THROTTLE_STORE = 'core.throttling.CacheBucketStore'
+THROTTLE_CACHE_ALIAS = 'default'
+
+# Cache
+# Local-memory stand-in; point this at Redis or Memcached in production so
+# cached entries are shared between worker processes.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'social-media-api',
+    }
+}
+
+# Writes sent with an Idempotency-Key header (creating posts and comments)
+# store their response for IDEMPOTENCY_KEY_TTL seconds and replay it for
+# retries with the same key (see core.idempotency). IDEMPOTENCY_LOCK_TIMEOUT
+# bounds how long an unfinished request holds its key.
+IDEMPOTENCY_CACHE_ALIAS = 'default'
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+IDEMPOTENCY_LOCK_TIMEOUT = 60
+
+# Login hardening (see accounts.login_guard): after LOGIN_ACCOUNT_FAILURE_LIMIT
+# failed logins for one username, or LOGIN_IP_FAILURE_LIMIT from one IP,
+# within LOGIN_FAILURE_WINDOW seconds, attempts are refused without hashing
+# for LOGIN_BACKOFF_BASE seconds, doubling per failure up to LOGIN_BACKOFF_MAX.
+# Passwords are checked on LOGIN_HASH_WORKERS threads (0: inline); logins
+# beyond LOGIN_HASH_MAX_PENDING in flight are refused with 429.
+LOGIN_GUARD_CACHE_ALIAS = 'default'
+LOGIN_ACCOUNT_FAILURE_LIMIT = 5
+LOGIN_IP_FAILURE_LIMIT = 20
+LOGIN_FAILURE_WINDOW = 3600
+LOGIN_BACKOFF_BASE = 1
+LOGIN_BACKOFF_MAX = 900
+LOGIN_HASH_WORKERS = 2
+LOGIN_HASH_MAX_PENDING = 16
+
+# Token -> user resolution is cached in the TOKEN_AUTH_CACHE_ALIAS cache (see
+# CACHES above) and in a per-process LRU with a shorter TTL (see
+# accounts.authentication).
+TOKEN_AUTH_CACHE_ALIAS = 'default'
+TOKEN_AUTH_CACHE_TIMEOUT = 300
+TOKEN_AUTH_LOCAL_CACHE_TIMEOUT = 30
+TOKEN_AUTH_LOCAL_CACHE_SIZE = 10000
+
+# Home timeline: authors with more followers than this are not fanned out on
+# write; their posts are merged into followers' feeds at read time instead.
+FEED_FANOUT_LIMIT = 10000
+# Latest posts copied into a follower's timeline when they follow an account.
+FEED_BACKFILL_POSTS = 20
+
+# Each user's set of followed account ids is cached for "does A follow B"
+# checks (see accounts.follows).
+FOLLOW_CACHE_ALIAS = 'default'
+FOLLOW_CACHE_TIMEOUT = 300
+
+# Number of latest comments embedded in each serialized post.
+POSTS_EMBEDDED_COMMENTS = 3
+
+# Bulk post/comment ingestion: maximum items per request and rows per
+# insert transaction.
+POSTS_BULK_MAX_ITEMS = 10000
+POSTS_BULK_CHUNK_SIZE = 500
+# Room for a full bulk request (the Django default is 2.5 MB).
+DATA_UPLOAD_MAX_MEMORY_SIZE = 32 * 1024 * 1024
+
+# Notifications: events are written to an outbox table and folded into
+# notifications by a background thread, which waits NOTIFICATIONS_BATCH_DELAY
+# seconds after a wake-up so bursts are coalesced in one batch. Set
+# NOTIFICATIONS_ASYNC = False to process the outbox inline on commit.
+NOTIFICATIONS_ASYNC = True
+NOTIFICATIONS_BATCH_SIZE = 500
+NOTIFICATIONS_BATCH_DELAY = 0.5
+NOTIFICATIONS_POLL_INTERVAL = 30
+
 # Media files (for profile pictures)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Stream every upload to a temporary file in chunks instead of holding small
+# ones in memory.
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+
+# Profile pictures: after an upload commits, PROFILE_PICTURE_WORKERS threads
+# write square, metadata-free thumbnails of each size in each format (see
+# accounts.images). User lists show the PROFILE_PICTURE_SUMMARY_SIZE variant.
+# Set PROFILE_PICTURE_ASYNC = False to make them inline on commit.
+PROFILE_PICTURE_ASYNC = True
+PROFILE_PICTURE_WORKERS = 2
+PROFILE_PICTURE_SIZES = (64, 128, 256, 512)
+PROFILE_PICTURE_FORMATS = ('webp', 'jpeg')
+PROFILE_PICTURE_SUMMARY_SIZE = 64
+PROFILE_PICTURE_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+# Browser cache lifetime of users/<pk>/picture/ redirects.
+PROFILE_PICTURE_REDIRECT_MAX_AGE = 300
@@ -7,6 +7,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('accounts.urls')),
     path('api/', include('posts.urls')),  # Add this
+    path('api/notifications/', include('notifications.urls')),
 ]
 
 # Serve media files in development